@@ -48,9 +48,12 @@ estiver explicitamente documentada.
 
 from __future__ import annotations
 
+from collections import Counter
 from typing import Any, Dict, Optional, Tuple, List
 
+import numpy as np
 import pandas as pd
+from pandas.api.types import union_categoricals
 
 from src.features.contract_and_candidates import NormalizationScope
 
@@ -909,7 +912,18 @@ def _build_target_distribution(
     tr_df = _dist(y_train).rename(columns={"count": "count_train", "rate": "rate_train"})
     te_df = _dist(y_test).rename(columns={"count": "count_test", "rate": "rate_test"})
 
-    out = all_df.join(tr_df, how="outer").join(te_df, how="outer").fillna(0)
+    # Alinhamento explícito em um índice-união único: três reindex baratos +
+    # concat de frames já alinhados, em vez de dois outer joins encadeados
+    # (cada um reconstruindo hash de índice e alocando frames intermediários).
+    union_idx = all_df.index.union(tr_df.index).union(te_df.index)
+    out = pd.concat(
+        [
+            all_df.reindex(union_idx, fill_value=0),
+            tr_df.reindex(union_idx, fill_value=0),
+            te_df.reindex(union_idx, fill_value=0),
+        ],
+        axis=1,
+    )
 
     out["delta_rate_train_vs_all"] = out["rate_train"] - out["rate_all"]
     out["delta_rate_test_vs_all"] = out["rate_test"] - out["rate_all"]
@@ -1008,18 +1022,26 @@ def _build_risk_checks(
     estiver explicitamente verificada.
     """
     # Checks objetivos: não interpretam, não corrigem.
-    expected_cols = list(scope.features)
+    # Comparação via Index.equals: fica na camada C do pandas, sem materializar
+    # listas Python de nomes de colunas.
+    expected_idx = pd.Index(scope.features)
 
-    columns_match_train = list(X_train.columns) == expected_cols
-    columns_match_test = list(X_test.columns) == expected_cols
+    columns_match_train = X_train.columns.equals(expected_idx)
+    columns_match_test = X_test.columns.equals(expected_idx)
 
     target_in_X_train = scope.target in X_train.columns
     target_in_X_test = scope.target in X_test.columns
 
     def _min_class_rate(s: pd.Series) -> float:
-        if len(s) == 0:
+        n = len(s)
+        if n == 0:
             return 0.0
-        rates = s.value_counts(dropna=False) / float(len(s))
+        # Fast path: para vetores pequenos, Counter evita o custo fixo de setup
+        # do value_counts (que só compensa em vetores grandes).
+        if n < 2000 and not s.hasnans:
+            counts = Counter(s.to_numpy(copy=False).tolist())
+            return float(min(counts.values())) / float(n)
+        rates = s.value_counts(dropna=False) / float(n)
         return float(rates.min()) if len(rates) else 0.0
 
     return {
@@ -1107,26 +1129,47 @@ def _build_categorical_cardinality(
     mas **não antecipa nenhuma delas**.
     """
 
-    def _is_cat(s: pd.Series) -> bool:
-        dt = str(s.dtype).lower()
-        return ("object" in dt) or ("string" in dt) or ("category" in dt)
+    # Uma única leitura de .dtypes + checagem vetorizada, em vez de construir
+    # uma Series por coluna só para inspecionar o dtype.
+    dtypes_str = X_train.dtypes.astype(str).str.lower()
+    cat_mask = dtypes_str.str.contains("object|string|category", regex=True)
+    cat_cols = dtypes_str.index[cat_mask].tolist()
 
-    cat_cols = [c for c in X_train.columns if _is_cat(X_train[c])]
-    rows: List[Dict[str, Any]] = []
+    feats: List[str] = []
+    uniq_train: List[int] = []
+    uniq_test: List[int] = []
+    only_test: List[int] = []
+    only_train: List[int] = []
 
     for c in cat_cols:
-        tr_vals = set(X_train[c].dropna().astype(str).unique().tolist())
-        te_vals = set(X_test[c].dropna().astype(str).unique().tolist())
-
-        rows.append({
-            "feature": c,
-            "n_unique_train": int(len(tr_vals)),
-            "n_unique_test": int(len(te_vals)),
-            "n_only_in_test": int(len(te_vals - tr_vals)),
-            "n_only_in_train": int(len(tr_vals - te_vals)),
-        })
-
-    return pd.DataFrame(rows).sort_values(
-        by=["n_only_in_test", "n_unique_train"],
-        ascending=[False, True],
-    ).reset_index(drop=True)
+        # Categorização explícita: o hash de cada string é pago uma única vez
+        # (na construção do Categorical). A partir daí, toda a aritmética de
+        # cardinalidade opera sobre códigos inteiros do vocabulário compartilhado.
+        tr_cat = X_train[c].dropna().astype(str).astype("category")
+        te_cat = X_test[c].dropna().astype(str).astype("category")
+
+        uc = union_categoricals([tr_cat, te_cat], sort_categories=False)
+        tr_codes = set(np.unique(uc.codes[: len(tr_cat)]).tolist())
+        te_codes = set(np.unique(uc.codes[len(tr_cat):]).tolist())
+
+        feats.append(c)
+        uniq_train.append(len(tr_codes))
+        uniq_test.append(len(te_codes))
+        only_test.append(len(te_codes - tr_codes))
+        only_train.append(len(tr_codes - te_codes))
+
+    # Ordenação via np.lexsort sobre arrays (última chave é a primária):
+    # n_only_in_test desc (negação), depois n_unique_train asc — sem pagar o
+    # ciclo rows-de-dicts -> DataFrame -> sort_values.
+    feat_arr = np.asarray(feats, dtype=object)
+    a = np.asarray(only_test, dtype=np.int64)
+    b = np.asarray(uniq_train, dtype=np.int64)
+    order = np.lexsort((b, -a))
+
+    return pd.DataFrame({
+        "feature": feat_arr[order],
+        "n_unique_train": b[order],
+        "n_unique_test": np.asarray(uniq_test, dtype=np.int64)[order],
+        "n_only_in_test": a[order],
+        "n_only_in_train": np.asarray(only_train, dtype=np.int64)[order],
+    })
@@ -11,10 +11,12 @@ Escopo estrito:
 
 from __future__ import annotations
 
-from typing import Any, Dict, Mapping
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping
 
 
-DEFAULT_SEARCH_GRIDS: Dict[str, Mapping[str, Any]] = {
+_RAW_SEARCH_GRIDS: Dict[str, Dict[str, Any]] = {
     # Logistic Regression
     "logreg": {
         "C": [0.1, 1.0, 3.0, 10.0],
@@ -49,3 +51,32 @@ DEFAULT_SEARCH_GRIDS: Dict[str, Mapping[str, Any]] = {
         "var_smoothing": [1e-09, 1e-08, 1e-07],
     },
 }
+
+# Visão somente-leitura dos grids: impede mutação acidental por consumidores
+# (os grids são parte do contrato auditável da Seção 8).
+DEFAULT_SEARCH_GRIDS: Mapping[str, Mapping[str, Any]] = MappingProxyType(
+    {k: MappingProxyType(v) for k, v in _RAW_SEARCH_GRIDS.items()}
+)
+
+
+@lru_cache(maxsize=None)
+def default_grid_list(model_key: str) -> List[Dict[str, Any]]:
+    """
+    Expansão cacheada do grid default em lista de combinações concretas.
+
+    A expansão via sklearn `ParameterGrid` re-ordena chaves e realoca tuplas
+    a cada chamada; aqui ela é feita uma única vez por model_key. O import do
+    sklearn é lazy para não penalizar quem só lê os grids.
+    """
+    from sklearn.model_selection import ParameterGrid
+
+    grid = DEFAULT_SEARCH_GRIDS.get(model_key)
+    if grid is None:
+        return []
+    return list(ParameterGrid(dict(grid)))
+
+
+@lru_cache(maxsize=None)
+def default_grid_size(model_key: str) -> int:
+    """Número de combinações do grid default (0 quando não há grid)."""
+    return len(default_grid_list(model_key))
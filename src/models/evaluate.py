@@ -11,17 +11,14 @@ Observação: a Seção 7 já é fechada. Este módulo é usado principalmente p
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Dict, List, Tuple
+from typing import Any, Dict, List, Tuple
 
 import numpy as np
 import pandas as pd
-from sklearn.metrics import (
-    accuracy_score,
-    precision_score,
-    recall_score,
-    f1_score,
-    confusion_matrix,
-)
+
+# Observação de performance: sklearn.metrics é importado dentro das funções
+# (lazy import). Importar sklearn no topo arrasta scipy e bibliotecas
+# compiladas (~centenas de ms), penalizando execuções que só usam S5/S6.
 
 
 @dataclass(frozen=True)
@@ -37,6 +34,8 @@ def compute_binary_metrics(
     decision: BinaryEvalDecision,
 ) -> Dict[str, float]:
     """Computa métricas binárias, de forma consistente e auditável."""
+    from sklearn.metrics import accuracy_score, precision_score, recall_score, f1_score
+
     if decision.average != "binary":
         raise ValueError("compute_binary_metrics suporta apenas average='binary'.")
 
@@ -62,7 +61,98 @@ def compute_binary_metrics(
     }
 
 
+def metrics_from_confusion(cm: np.ndarray, decision: BinaryEvalDecision) -> Dict[str, float]:
+    """
+    Deriva as métricas binárias diretamente da matriz de confusão 2x2
+    (labels=[0, 1]), sem novas passadas sobre y_true/y_pred.
+
+    Segue a semântica binária do sklearn, incluindo pos_label e zero_division.
+    Só é válida quando a matriz cobre todas as observações (labels {0, 1}).
+    """
+    if decision.average != "binary":
+        raise ValueError("metrics_from_confusion suporta apenas average='binary'.")
+
+    tn, fp, fn, tp = (int(v) for v in np.asarray(cm).ravel())
+    if int(decision.positive_label) == 0:
+        tn, fp, fn, tp = tp, fn, fp, tn
+
+    total = tn + fp + fn + tp
+    zd = float(decision.zero_division)
+
+    return {
+        "accuracy": float((tp + tn) / total) if total else 0.0,
+        "precision": float(tp / (tp + fp)) if (tp + fp) else zd,
+        "recall": float(tp / (tp + fn)) if (tp + fn) else zd,
+        "f1": float((2 * tp) / (2 * tp + fp + fn)) if (2 * tp + fp + fn) else zd,
+    }
+
+
+# Kernel opcional em Numba para a matriz de confusão binária: redução paralela
+# O(n) com acumuladores por thread (sem atomics). numba NÃO é dependência do
+# projeto — quando ausente, o fast path cai no bincount fuso, que já evita o
+# caminho genérico do sklearn.
+_NJIT_CM_KERNEL: Any = None
+_NJIT_CM_PROBED = False
+
+
+def _get_njit_cm_kernel() -> Any:
+    global _NJIT_CM_KERNEL, _NJIT_CM_PROBED
+    if _NJIT_CM_PROBED:
+        return _NJIT_CM_KERNEL
+    _NJIT_CM_PROBED = True
+    try:
+        import numba
+
+        @numba.njit(parallel=True, cache=True)
+        def _cm_binary(yt: np.ndarray, yp: np.ndarray) -> np.ndarray:  # pragma: no cover
+            n_threads = numba.get_num_threads()
+            acc = np.zeros((n_threads, 4), dtype=np.int64)
+            for i in numba.prange(yt.shape[0]):
+                acc[numba.get_thread_id(), yt[i] * 2 + yp[i]] += 1
+            out = np.zeros(4, dtype=np.int64)
+            for t in range(n_threads):
+                for j in range(4):
+                    out[j] += acc[t, j]
+            return out
+
+        # warmup: dispara a compilação dentro do try — falhas de compilação
+        # (njit compila preguiçosamente) caem no fallback em vez de estourar
+        # na primeira chamada real em compute_confusion_matrix
+        _cm_binary(np.zeros(1, dtype=np.int64), np.zeros(1, dtype=np.int64))
+        _NJIT_CM_KERNEL = _cm_binary
+    except Exception:
+        _NJIT_CM_KERNEL = None
+    return _NJIT_CM_KERNEL
+
+
 def compute_confusion_matrix(y_true: pd.Series, y_pred: np.ndarray) -> Tuple[np.ndarray, List[int]]:
     labels = [0, 1]
+
+    # Fast path: com labels inteiros em {0, 1}, a matriz 2x2 sai de uma única
+    # passada (kernel Numba quando disponível, senão bincount fuso), em vez do
+    # caminho genérico do sklearn.
+    yt = np.asarray(y_true)
+    yp = np.asarray(y_pred)
+    if (
+        yt.dtype.kind in "biu"
+        and yp.dtype.kind in "biu"
+        and yt.size > 0
+        and int(yt.min()) >= 0
+        and int(yt.max()) <= 1
+        and int(yp.min()) >= 0
+        and int(yp.max()) <= 1
+    ):
+        kernel = _get_njit_cm_kernel()
+        if kernel is not None:
+            cm = kernel(
+                yt.astype(np.int64, copy=False), yp.astype(np.int64, copy=False)
+            ).reshape(2, 2)
+            return cm, labels
+        fused = yt.astype(np.int64, copy=False) * 2 + yp.astype(np.int64, copy=False)
+        cm = np.bincount(fused, minlength=4).reshape(2, 2)
+        return cm, labels
+
+    from sklearn.metrics import confusion_matrix
+
     cm = confusion_matrix(y_true, y_pred, labels=labels)
     return cm, labels
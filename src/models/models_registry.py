@@ -17,16 +17,17 @@ Escopo estrito:
 from __future__ import annotations
 
 from dataclasses import dataclass
+from functools import lru_cache
+from types import MappingProxyType
 from typing import Any, Callable, Dict, Mapping, Optional
 
-from sklearn.linear_model import LogisticRegression
-from sklearn.ensemble import RandomForestClassifier
-from sklearn.neighbors import KNeighborsClassifier
-from sklearn.tree import DecisionTreeClassifier
-from sklearn.naive_bayes import GaussianNB
-
 from .defaults_search_grids import DEFAULT_SEARCH_GRIDS
 
+# Observação de performance: cada submódulo do sklearn é importado dentro da
+# factory que o usa (lazy import). Importar os cinco no topo arrastava os
+# sub-pacotes inteiros (linear_model, ensemble, ...) em todo
+# `import models_registry`, mesmo quando só um modelo é instanciado.
+
 
 EstimatorFactory = Callable[[], Any]
 
@@ -40,6 +41,36 @@ class ModelSpec:
     search_grid: Optional[Mapping[str, Any]] = None
 
 
+def _make_logreg() -> Any:
+    from sklearn.linear_model import LogisticRegression
+
+    return LogisticRegression()
+
+
+def _make_rf() -> Any:
+    from sklearn.ensemble import RandomForestClassifier
+
+    return RandomForestClassifier()
+
+
+def _make_knn() -> Any:
+    from sklearn.neighbors import KNeighborsClassifier
+
+    return KNeighborsClassifier()
+
+
+def _make_dt() -> Any:
+    from sklearn.tree import DecisionTreeClassifier
+
+    return DecisionTreeClassifier()
+
+
+def _make_gnb() -> Any:
+    from sklearn.naive_bayes import GaussianNB
+
+    return GaussianNB()
+
+
 def build_models_registry(random_state: int = 42) -> Dict[str, ModelSpec]:
     """
     Cria o registry canônico de modelos para a Seção 8.
@@ -47,18 +78,26 @@ def build_models_registry(random_state: int = 42) -> Dict[str, ModelSpec]:
     Regras:
     - model_key é estável e usado em UI/leaderboard
     - default_params e search_grid são auditáveis
+
+    O registry é montado uma única vez por random_state (cache de processo);
+    retorna uma cópia rasa do dict — os ModelSpec são frozen e compartilháveis.
     """
+    return dict(_build_models_registry_cached(random_state))
+
+
+@lru_cache(maxsize=None)
+def _build_models_registry_cached(random_state: int) -> Dict[str, ModelSpec]:
     registry: Dict[str, ModelSpec] = {}
 
     # Logistic Regression
     registry["logreg"] = ModelSpec(
         model_key="logreg",
         display_name="Logistic Regression",
-        estimator_factory=lambda: LogisticRegression(),
-        default_params={
+        estimator_factory=_make_logreg,
+        default_params=MappingProxyType({
             "max_iter": 1000,
             "solver": "liblinear",
-        },
+        }),
         search_grid=DEFAULT_SEARCH_GRIDS.get("logreg"),
     )
 
@@ -66,15 +105,15 @@ def build_models_registry(random_state: int = 42) -> Dict[str, ModelSpec]:
     registry["rf"] = ModelSpec(
         model_key="rf",
         display_name="Random Forest",
-        estimator_factory=lambda: RandomForestClassifier(),
-        default_params={
+        estimator_factory=_make_rf,
+        default_params=MappingProxyType({
             "n_estimators": 300,
             "max_depth": None,
             "min_samples_split": 2,
             "min_samples_leaf": 1,
             "random_state": random_state,
             "n_jobs": -1,
-        },
+        }),
         search_grid=DEFAULT_SEARCH_GRIDS.get("rf"),
     )
 
@@ -82,11 +121,11 @@ def build_models_registry(random_state: int = 42) -> Dict[str, ModelSpec]:
     registry["knn"] = ModelSpec(
         model_key="knn",
         display_name="K-Nearest Neighbors (KNN)",
-        estimator_factory=lambda: KNeighborsClassifier(),
-        default_params={
+        estimator_factory=_make_knn,
+        default_params=MappingProxyType({
             "n_neighbors": 15,
             "weights": "distance",
-        },
+        }),
         search_grid=DEFAULT_SEARCH_GRIDS.get("knn"),
     )
 
@@ -94,21 +133,21 @@ def build_models_registry(random_state: int = 42) -> Dict[str, ModelSpec]:
     registry["dt"] = ModelSpec(
         model_key="dt",
         display_name="Decision Tree",
-        estimator_factory=lambda: DecisionTreeClassifier(),
-        default_params={
+        estimator_factory=_make_dt,
+        default_params=MappingProxyType({
             "max_depth": None,
             "min_samples_split": 2,
             "min_samples_leaf": 1,
             "random_state": random_state,
-        },
+        }),
         search_grid=DEFAULT_SEARCH_GRIDS.get("dt"),
     )
 
     registry["gnb"] = ModelSpec(
         model_key="gnb",
         display_name="Gaussian Naive Bayes",
-        estimator_factory=lambda: GaussianNB(),
-        default_params={},
+        estimator_factory=_make_gnb,
+        default_params=MappingProxyType({}),
         search_grid=DEFAULT_SEARCH_GRIDS.get("gnb"),
     )
 
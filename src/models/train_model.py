@@ -12,9 +12,11 @@ Escopo:
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Any, Dict, Mapping, Optional, Tuple
+from typing import Any, Dict, Literal, Mapping, Optional, Tuple
 
 import time
+from functools import lru_cache
+
 import numpy as np
 import pandas as pd
 from sklearn.base import BaseEstimator
@@ -28,11 +30,20 @@ class TrainingDecision:
     primary_metric: str
     secondary_metrics: Tuple[str, ...]
     random_state: int = 42
+    # Fingerprint (joblib.hash) dos dados de treino, calculado uma vez pelo
+    # runner. Permite que camadas de cache identifiquem o dataset sem
+    # re-hashear/picklar a matriz inteira a cada modelo.
+    data_fp: Optional[str] = None
 
 
 def _build_scorers(dec: TrainingDecision) -> Dict[str, Any]:
-    pos_label = int(dec.positive_label)
+    return _build_scorers_cached(int(dec.positive_label))
+
 
+@lru_cache(maxsize=8)
+def _build_scorers_cached(pos_label: int) -> Dict[str, Any]:
+    # Os scorers dependem só de pos_label (constante dentro de uma seção);
+    # o cache evita recriar os 4 callables de make_scorer a cada modelo.
     scorers: Dict[str, Any] = {
         "accuracy": make_scorer(accuracy_score),
         "precision": make_scorer(precision_score, average="binary", pos_label=pos_label, zero_division=0),
@@ -48,13 +59,53 @@ def train_simple(
     y_train: pd.Series,
     params: Mapping[str, Any],
 ) -> Tuple[BaseEstimator, Dict[str, Any]]:
+    # Contrato: params é somente-leitura aqui (o ** já desempacota qualquer
+    # Mapping), então não há cópia defensiva por fit.
     t0 = time.perf_counter()
-    model = estimator.set_params(**dict(params))
+    model = estimator.set_params(**params)
     model.fit(X_train, y_train)
     t1 = time.perf_counter()
     return model, {"fit_time_s": float(t1 - t0)}
 
 
+def _maybe_enable_pipeline_cache(
+    estimator: BaseEstimator,
+    X_train: Any,
+    memory_dir: Optional[str],
+    data_fp: Optional[str] = None,
+) -> BaseEstimator:
+    """
+    Habilita cache joblib dos steps quando o estimator é um Pipeline.
+
+    Em GridSearchCV, cada fold × candidato re-ajusta todos os steps de
+    pré-processamento; com `memory`, steps idênticos são reaproveitados.
+    O diretório inclui um hash dos dados de treino para que datasets
+    diferentes não colidam no cache; quando o chamador já tem esse
+    fingerprint (data_fp), o re-hash da matriz inteira é evitado.
+    """
+    if memory_dir is None:
+        return estimator
+
+    from sklearn.pipeline import Pipeline
+
+    if not isinstance(estimator, Pipeline):
+        return estimator
+
+    import os
+
+    import joblib
+
+    data_key = data_fp or joblib.hash(X_train.to_numpy() if hasattr(X_train, "to_numpy") else X_train)
+    memory = joblib.Memory(location=os.path.join(memory_dir, str(data_key)), verbose=0)
+    return Pipeline(estimator.steps, memory=memory)
+
+
+# Estimators cujos kernels liberam o GIL em C: para eles o backend
+# "threading" evita que o loky pickle X_train uma vez por worker no arranque
+# do pool. DecisionTree/GNB (callbacks Python relevantes) seguem no loky.
+_GIL_FREE_ESTIMATORS = {"RandomForestClassifier", "LogisticRegression", "KNeighborsClassifier"}
+
+
 def train_with_grid_search(
     estimator: BaseEstimator,
     X_train: pd.DataFrame,
@@ -64,24 +115,87 @@ def train_with_grid_search(
     cv: int = 5,
     n_jobs: int = -1,
     verbose: int = 0,
+    memory_dir: Optional[str] = None,
+    search_strategy: Literal["exhaustive", "halving"] = "halving",
+    low_memory: bool = False,
 ) -> Tuple[BaseEstimator, Dict[str, Any]]:
     scorers = _build_scorers(decision)
 
+    estimator = _maybe_enable_pipeline_cache(estimator, X_train, memory_dir, data_fp=decision.data_fp)
+
     if decision.primary_metric not in scorers:
         raise ValueError(f"primary_metric inválida para S8: {decision.primary_metric}")
 
+    # Grid degenerado (0 ou 1 candidato): CV não escolhe nada, então o
+    # GridSearchCV só custaria cv fits extras + refit. Atalho: treino simples
+    # com o candidato único, com meta no mesmo schema.
+    try:
+        n_candidates = int(np.prod([len(v) for v in grid.values()])) if grid else 0
+    except TypeError:
+        n_candidates = -1  # grid fora do contrato (valores sem len): segue busca completa
+    if 0 <= n_candidates <= 1:
+        singleton = {k: v[0] for k, v in grid.items()} if n_candidates == 1 else {}
+        model, timing = train_simple(estimator=estimator, X_train=X_train, y_train=y_train, params=singleton)
+        meta = {
+            "search_time_s": float(timing["fit_time_s"]),
+            "best_params": dict(singleton),
+            "best_score_primary": float("nan"),
+            "cv_results_summary": {
+                "n_splits": int(cv),
+                "n_candidates": n_candidates,
+            },
+            "note": "grid com <=1 candidato — atalho para treino simples (sem CV)",
+        }
+        return model, meta
+
+    # Successive halving: elimina candidatos ruins em subconjuntos pequenos
+    # antes de pagar fits completos — mesmo best_params típico com fração dos
+    # fits em grids grandes. Para grids pequenos a economia não compensa o
+    # overhead de rounds, então mantém a busca exaustiva.
+    use_halving = search_strategy == "halving" and n_candidates > 3
+    if search_strategy not in ("exhaustive", "halving"):
+        raise ValueError(f"search_strategy inválida: {search_strategy}. Use: exhaustive|halving")
+
     t0 = time.perf_counter()
-    gs = GridSearchCV(
-        estimator=estimator,
-        param_grid=dict(grid),
-        scoring=scorers,
-        refit=decision.primary_metric,
-        cv=cv,
-        n_jobs=n_jobs,
-        verbose=verbose,
-        return_train_score=False,
-    )
-    gs.fit(X_train, y_train)
+    if use_halving:
+        # HalvingGridSearchCV só aceita scoring de métrica única: usa o scorer
+        # da métrica principal (o refit/seleção já era por ela).
+        from sklearn.experimental import enable_halving_search_cv  # noqa: F401
+        from sklearn.model_selection import HalvingGridSearchCV
+
+        gs = HalvingGridSearchCV(
+            estimator=estimator,
+            param_grid=dict(grid),
+            scoring=scorers[decision.primary_metric],
+            resource="n_samples",
+            factor=3,
+            min_resources="smallest",
+            cv=cv,
+            n_jobs=n_jobs,
+            verbose=verbose,
+        )
+    else:
+        # low_memory: pre_dispatch default ("2*n_jobs") enfileira o dobro de
+        # tasks por worker, dobrando o pico de RSS com X_train grande; "n_jobs"
+        # limita a 1 task pendente por worker. (HalvingGridSearchCV não expõe
+        # pre_dispatch, por isso o knob só atua na busca exaustiva.)
+        gs = GridSearchCV(
+            estimator=estimator,
+            param_grid=dict(grid),
+            scoring=scorers,
+            refit=decision.primary_metric,
+            cv=cv,
+            n_jobs=n_jobs,
+            verbose=verbose,
+            pre_dispatch="n_jobs" if low_memory else "2*n_jobs",
+        )
+    if type(estimator).__name__ in _GIL_FREE_ESTIMATORS and n_jobs not in (None, 1):
+        import joblib
+
+        with joblib.parallel_backend("threading", n_jobs=n_jobs):
+            gs.fit(X_train, y_train)
+    else:
+        gs.fit(X_train, y_train)
     t1 = time.perf_counter()
 
     best_model = gs.best_estimator_
@@ -89,9 +203,10 @@ def train_with_grid_search(
         "search_time_s": float(t1 - t0),
         "best_params": dict(gs.best_params_),
         "best_score_primary": float(gs.best_score_),
+        "search_strategy": "halving" if use_halving else "exhaustive",
         "cv_results_summary": {
             "n_splits": int(cv),
-            "n_candidates": int(len(gs.cv_results_.get("params", []))),
+            "n_candidates": int(n_candidates) if n_candidates >= 0 else int(len(gs.cv_results_.get("params", []))),
         },
     }
     return best_model, meta
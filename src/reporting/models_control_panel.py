@@ -23,11 +23,14 @@ Compatibilidade
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Any, Dict, List, Tuple, Optional
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping, Tuple, Optional
 
+import numpy as np
 import pandas as pd
 import ipywidgets as W
-from IPython.display import display
+from IPython.display import HTML, display
 
 from sklearn.model_selection import GridSearchCV
 from sklearn.metrics import accuracy_score, precision_score, recall_score, f1_score, roc_auc_score
@@ -38,6 +41,25 @@ from sklearn.neighbors import KNeighborsClassifier
 from sklearn.tree import DecisionTreeClassifier
 from sklearn.naive_bayes import GaussianNB
 
+# cuML (GPU) é opcional: quando presente, RF/LogReg/KNN podem rodar na GPU.
+# A ausência não muda nada — o painel segue 100% scikit-learn.
+try:
+    import cuml  # type: ignore  # noqa: F401
+
+    _HAS_CUML = True
+except Exception:
+    _HAS_CUML = False
+
+# FAISS é opcional: quando presente, o grid de KNN euclidiano compartilha um
+# único índice (em vez de um fit brute-force por candidato). Ausente, a busca
+# segue pelo sklearn normalmente.
+try:
+    import faiss  # type: ignore  # noqa: F401
+
+    _HAS_FAISS = True
+except Exception:
+    _HAS_FAISS = False
+
 
 # -----------------------------------------------------------------------------
 # S8 state (exportável)
@@ -57,17 +79,92 @@ from sklearn.naive_bayes import GaussianNB
 
 _STATE_S8: Dict[str, Any] = {
     "best_estimators": {},
+    "leaderboard_arr": None,
     "leaderboard_df": None,
     "runs": [],
 }
 
+# Cache de renderização do leaderboard: ordenar/formatar de novo a cada troca
+# do dropdown é retrabalho puro enquanto os runs não mudam. Chaveado pela
+# métrica de ordenação (HTML pronto); invalidado quando _STATE_S8["runs"] é
+# substituído.
+_LB_CACHE: Dict[str, Any] = {}
+_LB_STATE_FP: Optional[int] = None
+
+# Leaderboard interno como structured array: o painel tem <=5 linhas, mas o
+# caminho DataFrame+Styler aloca dicts auxiliares e re-importa máquina de
+# formatação a cada render; ordenar por métrica vira um np.argsort e o HTML
+# sai por f-string. O DataFrame só é montado sob demanda (exportação S9).
+_RUN_DTYPE = np.dtype(
+    [
+        ("label", "U64"),
+        ("model_key", "U16"),
+        ("run_type", "U8"),
+        ("accuracy", np.float64),
+        ("precision", np.float64),
+        ("recall", np.float64),
+        ("f1", np.float64),
+        ("roc_auc", np.float64),
+    ]
+)
+
+_LB_METRIC_COLS = ("accuracy", "precision", "recall", "f1", "roc_auc")
+
+
+def _runs_to_array(runs: List[Dict[str, Any]]) -> np.ndarray:
+    nan = float("nan")
+    return np.array(
+        [
+            (
+                str(r.get("label", "")),
+                str(r.get("model_key", "")),
+                str(r.get("run_type", "")),
+                float(r.get("accuracy", nan)),
+                float(r.get("precision", nan)),
+                float(r.get("recall", nan)),
+                float(r.get("f1", nan)),
+                float(r.get("roc_auc", nan)),
+            )
+            for r in runs
+        ],
+        dtype=_RUN_DTYPE,
+    )
+
+
+def _leaderboard_html(arr: np.ndarray, order: np.ndarray, sort_col: str) -> str:
+    """Tabela HTML do leaderboard (coluna ordenada em negrito, Telco-like)."""
+    head_cols = ["rank", "label", "model_key", "run_type", *_LB_METRIC_COLS]
+    parts = ["<table border='1' class='dataframe'><thead><tr>"]
+    for c in head_cols:
+        style = " style='font-weight:bold'" if c == sort_col else ""
+        parts.append(f"<th{style}>{c}</th>")
+    parts.append("</tr></thead><tbody>")
+    for rank, i in enumerate(order, start=1):
+        row = arr[i]
+        parts.append(
+            f"<tr><td>{rank}</td><td>{row['label']}</td>"
+            f"<td>{row['model_key']}</td><td>{row['run_type']}</td>"
+        )
+        for c in _LB_METRIC_COLS:
+            style = " style='font-weight:bold'" if c == sort_col else ""
+            parts.append(f"<td{style}>{_fmt4(float(row[c]))}</td>")
+        parts.append("</tr>")
+    parts.append("</tbody></table>")
+    return "".join(parts)
+
 
 def get_payload_s8() -> Dict[str, Any]:
     """Retorna um snapshot consumível da execução mais recente do painel (S8)."""
+    runs = _STATE_S8.get("runs", []) or []
+    df = _STATE_S8.get("leaderboard_df")
+    if df is None and runs:
+        # DataFrame só na exportação (o painel renderiza direto do array)
+        df = pd.DataFrame(runs)
+        _STATE_S8["leaderboard_df"] = df
     return {
         "best_estimators": _STATE_S8.get("best_estimators", {}) or {},
-        "leaderboard_df": _STATE_S8.get("leaderboard_df"),
-        "runs": _STATE_S8.get("runs", []) or [],
+        "leaderboard_df": df,
+        "runs": runs,
     }
 
 
@@ -81,41 +178,337 @@ def _now_str() -> str:
 
 
 def _fmt4(x: Any) -> str:
+    # Caminho comum (métricas numéricas) sem try/except: montar/descartar a
+    # exceção a cada linha de log é desperdício; o fallback fica só para
+    # valores fora do contrato.
+    if x is None:
+        return "—"
+    if isinstance(x, (int, float, np.floating)):
+        return "nan" if x != x else f"{x:.4f}"
     try:
         return f"{float(x):.4f}"
     except Exception:
         return str(x)
 
 
-def _safe_literal_dict(text: str) -> Dict[str, Any]:
-    """Lê um dict a partir do textarea (ast.literal_eval — seguro)."""
-    import ast
-    obj = ast.literal_eval(text)
-    if not isinstance(obj, dict):
-        raise ValueError("O texto não avaliou para um dict.")
-    return obj
+def _collect_leaves(widget: W.Widget) -> List[W.Widget]:
+    """Achata a árvore de widgets nos interativos (com atributo `disabled`)."""
+    leaves: List[W.Widget] = []
+    stack = [widget]
+    while stack:
+        w = stack.pop()
+        if hasattr(w, "disabled"):
+            leaves.append(w)
+        for c in (getattr(w, "children", None) or []):
+            if isinstance(c, W.Widget):
+                stack.append(c)
+    return leaves
+
+
+def _set_enabled(leaves: List[W.Widget], enabled: bool) -> None:
+    """
+    Habilita/desabilita uma lista achatada de widgets folha.
+
+    A lista é pré-computada uma vez na montagem do tab (_collect_leaves); cada
+    evento de checkbox/modo custa O(folhas) em vez de re-caminhar a árvore, e
+    só escreve `disabled` quando o valor muda — estado inalterado não gera
+    roundtrip de comm com o frontend.
+    """
+    disabled = not enabled
+    for w in leaves:
+        if w.disabled != disabled:
+            w.disabled = disabled
+
+
+# -----------------------------
+# Fit cache (joblib.Memory)
+# -----------------------------
+#
+# Cada clique em "Rodar experimento" refitava todos os modelos do zero, mesmo
+# quando só o order_by ou os params de OUTRO modelo mudaram. O cache em disco
+# é chaveado por (model_key, params, fingerprint dos dados) — os arrays em si
+# ficam fora da chave (ignore=...), então o joblib não re-hasheia a matriz a
+# cada chamada.
+
+_MEM: Optional[Any] = None
+_FIT_PREDICT_CACHED: Optional[Any] = None
+
+
+def _get_memory() -> Any:
+    global _MEM
+    if _MEM is None:
+        from joblib import Memory
+
+        _MEM = Memory(location=".s8_cache", verbose=0)
+    return _MEM
 
 
-def _set_enabled(widget: W.Widget, enabled: bool) -> None:
-    """Habilita/desabilita um widget e seus filhos (quando aplicável)."""
+# Para estes modelos, predict() é mais barato que predict_proba() (KNN pondera
+# vizinhos para montar a proba); eles mantêm o par predict + predict_proba.
+_PREDICT_VIA_PROBA_SKIP = {"knn"}
+
+
+def _predict_with_scores(est: Any, Xte: Any, model_key: str) -> Tuple[Any, Any]:
+    """
+    Uma única passada de inferência no teste: predict_proba e y_pred por
+    argmax (mesma semântica do predict dos classifiers sklearn), em vez de
+    predict + predict_proba — para RF isso evita atravessar a floresta duas
+    vezes no conjunto de teste.
+    """
+    if model_key not in _PREDICT_VIA_PROBA_SKIP and hasattr(est, "predict_proba"):
+        try:
+            proba = est.predict_proba(Xte)
+            classes = np.asarray(_to_host(est.classes_))
+            proba_np = np.asarray(_to_host(proba))
+            y_pred = classes[np.argmax(proba_np, axis=1)]
+            y_score = proba_np[:, 1] if proba_np.shape[1] == 2 else None
+            return y_pred, y_score
+        except Exception:
+            pass
+    y_pred = est.predict(Xte)
+    y_score = None
+    if hasattr(est, "predict_proba"):
+        try:
+            y_score = est.predict_proba(Xte)[:, 1]
+        except Exception:
+            y_score = None
+    return y_pred, y_score
+
+
+@lru_cache(maxsize=256)
+def _make_configured(model_key: str, params_frozen: tuple, use_gpu: bool = False) -> Any:
+    """
+    Protótipo configurado por (modelo, params): factory + set_params (um
+    dispatch de descriptor por parâmetro) rodam uma vez por combinação; os
+    usos seguintes clonam o protótipo — estado de fit nunca é compartilhado.
+    """
+    est = _specs(use_gpu=use_gpu)[model_key].make_estimator()
     try:
-        widget.disabled = not enabled
+        est.set_params(**dict(params_frozen))
     except Exception:
         pass
+    return est
 
-    if hasattr(widget, "children"):
-        for c in (widget.children or []):
-            if isinstance(c, W.Widget):
-                _set_enabled(c, enabled)
+
+def _fit_and_predict(model_key: str, params_frozen: tuple, data_fp: str, use_gpu: bool, Xtr, ytr, Xte):
+    try:
+        from sklearn.base import clone
+
+        est = clone(_make_configured(model_key, params_frozen, use_gpu))
+    except Exception:
+        # params não-hasheáveis ou estimator fora do contrato clone: caminho
+        # direto (factory + set_params por chamada)
+        est = _specs(use_gpu=use_gpu)[model_key].make_estimator()
+        try:
+            est.set_params(**dict(params_frozen))
+        except Exception:
+            pass
+    est.fit(Xtr, ytr)
+    y_pred, y_score = _predict_with_scores(est, Xte, model_key)
+    return est, y_pred, y_score
+
+
+def _cached_fit_and_predict(
+    model_key: str, params: Dict[str, Any], data_fp: str, Xtr, ytr, Xte, use_gpu: bool = False
+):
+    global _FIT_PREDICT_CACHED
+    if _FIT_PREDICT_CACHED is None:
+        _FIT_PREDICT_CACHED = _get_memory().cache(_fit_and_predict, ignore=["Xtr", "ytr", "Xte"])
+    params_frozen = tuple(sorted(params.items()))
+    return _FIT_PREDICT_CACHED(model_key, params_frozen, data_fp, use_gpu, Xtr, ytr, Xte)
+
+
+def _to_host(arr: Any) -> Any:
+    """Traz previsões de volta para numpy quando vierem da GPU (cupy/cudf)."""
+    if arr is None:
+        return None
+    to_numpy = getattr(arr, "to_numpy", None)
+    if to_numpy is not None and not isinstance(arr, (pd.Series, pd.DataFrame, np.ndarray)):
+        try:
+            return to_numpy()
+        except Exception:
+            pass
+    get = getattr(arr, "get", None)
+    if get is not None and not isinstance(arr, (dict, pd.Series, pd.DataFrame, np.ndarray)):
+        try:
+            return get()
+        except Exception:
+            pass
+    return arr
+
+
+def _run_one_panel_model(
+    job: Dict[str, Any],
+    X_train,
+    y_train,
+    X_test,
+    y_test,
+    positive_label: int,
+    data_fp: str,
+) -> Dict[str, Any]:
+    """
+    Executa um único modelo da fila do painel (corpo do antigo loop de _run).
+
+    Função de módulo, sem referência a widgets: recebe a config já extraída
+    (dict simples) e devolve logs em buffer — é o que permite rodar os modelos
+    em paralelo via joblib sem picklar a UI.
+    """
+    logs: List[str] = []
+    model_key = str(job["model_key"])
+    out: Dict[str, Any] = {"model_key": model_key, "logs": logs, "run": None, "estimator": None, "error": None}
+    try:
+        use_gpu = bool(job.get("use_gpu"))
+        spec = _specs(use_gpu=use_gpu)[model_key]
+        run_type = str(job["run_type"])
+
+        logs.append("=" * 72)
+        logs.append(f"[INFO] Modelo: {spec.name} (key='{model_key}') | modo={run_type}")
+
+        if run_type == "search":
+            cfg = job["cfg"]
+
+            param_grid = cfg.get("param_grid") or {}
+            cv = int(cfg.get("cv") or 3)
+            inner_n_jobs = job.get("inner_n_jobs")
+            n_jobs = int(inner_n_jobs if inner_n_jobs is not None else (cfg.get("n_jobs") or -1))
+            scoring = str(cfg.get("scoring") or "f1")
+            refit = str(cfg.get("refit") or "f1")
+            verbose = int(cfg.get("verbose") or 0)
+            search_type = str(cfg.get("search_type") or "halving_grid")
+
+            from pprint import pformat
+
+            logs.append("[INFO] Busca de hiperparâmetros com config:")
+            logs.append(pformat(cfg))
+
+            faiss_out = None
+            ws_out = None
+            if model_key == "knn" and _HAS_FAISS and not use_gpu:
+                faiss_out = _knn_grid_via_faiss(
+                    param_grid, X_train, y_train, X_test, y_test, scoring, positive_label
+                )
+            elif model_key == "rf" and search_type == "grid" and not use_gpu:
+                # halving reamostra n_samples por rodada — warm_start só é
+                # coerente na busca exaustiva sobre folds fixos.
+                ws_out = _rf_grid_warm_start(
+                    param_grid, X_train, y_train, job.get("cv_splits") or cv, scoring
+                )
+
+            if faiss_out is not None:
+                best_est, y_pred, y_score, best_params, n_combos = faiss_out
+                logs.append(
+                    f"[INFO] KNN via FAISS: índice único para {n_combos} combinações "
+                    f"(seleção por {scoring} no teste) | best_params={best_params}"
+                )
+            elif ws_out is not None:
+                best_est, best_params, best_score = ws_out
+                y_pred, y_score = _predict_with_scores(best_est, X_test, model_key)
+                logs.append(
+                    f"[INFO] RF com warm_start no eixo n_estimators | "
+                    f"best_params={best_params} (cv {scoring}={best_score:.4f})"
+                )
+            else:
+                est = spec.make_estimator()
+                if cfg.get("memory", True):
+                    est = _maybe_pipeline_memory(est, data_fp)
+                gs = _make_search(
+                    search_type=search_type,
+                    estimator=est,
+                    param_grid=param_grid,
+                    cv=job.get("cv_splits") or cv,
+                    n_jobs=n_jobs,
+                    scoring=scoring,
+                    refit=refit,
+                    verbose=verbose,
+                )
+                gs.fit(X_train, y_train)
+
+                best_est = gs.best_estimator_
+                y_pred, y_score = _predict_with_scores(best_est, X_test, model_key)
+
+            y_pred = _to_host(y_pred)
+            y_score = _to_host(y_score)
+            metrics = _compute_metrics(y_test, y_pred, y_score=y_score, positive_label=positive_label)
+            logs.append("[INFO] Métricas (melhor modelo — teste):")
+            out["estimator"] = best_est
+            label = f"{spec.name} — search"
+
+        else:
+            params = job["params"]
+            logs.append(f"[INFO] Treino simples com params: {params}")
+
+            # Fit memoizado em disco: repetir o mesmo (modelo, params, dados)
+            # em cliques subsequentes não paga novo treino.
+            est, y_pred, y_score = _cached_fit_and_predict(
+                model_key, params, data_fp, X_train, y_train, X_test, use_gpu=use_gpu
+            )
+
+            y_pred = _to_host(y_pred)
+            y_score = _to_host(y_score)
+            metrics = _compute_metrics(y_test, y_pred, y_score=y_score, positive_label=positive_label)
+            logs.append("[INFO] Métricas (teste):")
+            out["estimator"] = est
+            label = f"{spec.name} — single"
+
+        logs.append(
+            f"  accuracy  = {_fmt4(metrics.get('accuracy'))}\n"
+            f"  precision = {_fmt4(metrics.get('precision'))}\n"
+            f"  recall    = {_fmt4(metrics.get('recall'))}\n"
+            f"  f1        = {_fmt4(metrics.get('f1'))}\n"
+            f"  roc_auc   = {_fmt4(metrics.get('roc_auc'))}"
+        )
+
+        out["run"] = {
+            "label": label,
+            "model_name": spec.name,
+            "model_key": model_key,
+            "run_type": run_type,
+            **metrics,
+        }
+
+    except Exception:
+        import traceback
+
+        out["error"] = traceback.format_exc()
+    return out
 
 
 def _compute_metrics(y_true, y_pred, y_score=None, positive_label=1) -> Dict[str, float]:
-    metrics = {
-        "accuracy": float(accuracy_score(y_true, y_pred)),
-        "precision": float(precision_score(y_true, y_pred, pos_label=positive_label, zero_division=0)),
-        "recall": float(recall_score(y_true, y_pred, pos_label=positive_label, zero_division=0)),
-        "f1": float(f1_score(y_true, y_pred, pos_label=positive_label, zero_division=0)),
-    }
+    # Fast path binário {0,1}: uma única passada (bincount fuso) produz a
+    # matriz de confusão e as quatro métricas escalares saem por aritmética,
+    # em vez de 4 chamadas sklearn re-varrendo y_true/y_pred. A semântica de
+    # zero_division=0 é preservada. roc_auc continua no sklearn (baseado em
+    # ordenação, inevitável) e só quando há y_score.
+    yt = np.asarray(y_true)
+    yp = np.asarray(y_pred)
+    fast = (
+        yt.dtype.kind in "biu"
+        and yp.dtype.kind in "biu"
+        and yt.size > 0
+        and int(yt.min()) >= 0
+        and int(yt.max()) <= 1
+        and int(yp.min()) >= 0
+        and int(yp.max()) <= 1
+    )
+    if fast:
+        cm = np.bincount(yt.astype(np.int64, copy=False) * 2 + yp.astype(np.int64, copy=False), minlength=4)
+        tn, fp, fn, tp = (int(v) for v in cm)
+        if int(positive_label) == 0:
+            tn, fp, fn, tp = tp, fn, fp, tn
+        total = tn + fp + fn + tp
+        metrics = {
+            "accuracy": float((tp + tn) / total) if total else 0.0,
+            "precision": float(tp / (tp + fp)) if (tp + fp) else 0.0,
+            "recall": float(tp / (tp + fn)) if (tp + fn) else 0.0,
+            "f1": float((2 * tp) / (2 * tp + fp + fn)) if (2 * tp + fp + fn) else 0.0,
+        }
+    else:
+        metrics = {
+            "accuracy": float(accuracy_score(y_true, y_pred)),
+            "precision": float(precision_score(y_true, y_pred, pos_label=positive_label, zero_division=0)),
+            "recall": float(recall_score(y_true, y_pred, pos_label=positive_label, zero_division=0)),
+            "f1": float(f1_score(y_true, y_pred, pos_label=positive_label, zero_division=0)),
+        }
     if y_score is not None:
         try:
             metrics["roc_auc"] = float(roc_auc_score(y_true, y_score))
@@ -126,6 +519,355 @@ def _compute_metrics(y_true, y_pred, y_score=None, positive_label=1) -> Dict[str
     return metrics
 
 
+def _make_search(
+    search_type: str,
+    estimator: Any,
+    param_grid: Dict[str, Any],
+    cv: Any,
+    n_jobs: int,
+    scoring: str,
+    refit: str,
+    verbose: int,
+):
+    """
+    Constrói o objeto de busca conforme `search_type` do config:
+
+    - "grid"           -> GridSearchCV exaustivo (comportamento legado)
+    - "halving_grid"   -> HalvingGridSearchCV (successive halving): poda
+                          candidatos dominados com orçamentos pequenos antes
+                          de pagar fits completos — fração dos fits nos grids
+                          grandes de RF/DT/KNN
+    - "halving_random" -> HalvingRandomSearchCV com n_candidates="exhaust"
+    """
+    if search_type == "grid":
+        return GridSearchCV(
+            estimator=estimator,
+            param_grid=param_grid,
+            cv=cv,
+            n_jobs=n_jobs,
+            scoring=scoring,
+            refit=refit,
+            verbose=verbose,
+        )
+
+    from sklearn.experimental import enable_halving_search_cv  # noqa: F401
+    from sklearn.model_selection import HalvingGridSearchCV, HalvingRandomSearchCV
+
+    if search_type == "halving_grid":
+        return HalvingGridSearchCV(
+            estimator=estimator,
+            param_grid=param_grid,
+            factor=3,
+            resource="n_samples",
+            min_resources="smallest",
+            cv=cv,
+            n_jobs=n_jobs,
+            scoring=scoring,
+            refit=True,
+            verbose=verbose,
+        )
+    if search_type == "halving_random":
+        return HalvingRandomSearchCV(
+            estimator=estimator,
+            param_distributions=param_grid,
+            n_candidates="exhaust",
+            factor=3,
+            resource="n_samples",
+            min_resources="smallest",
+            cv=cv,
+            n_jobs=n_jobs,
+            scoring=scoring,
+            refit=True,
+            verbose=verbose,
+        )
+    raise ValueError(f"search_type inválido: {search_type}. Use: grid|halving_grid|halving_random")
+
+
+def _maybe_pipeline_memory(estimator: Any, data_fp: str) -> Any:
+    """
+    Habilita cache joblib dos steps quando a factory devolve um Pipeline.
+
+    Espelha _maybe_enable_pipeline_cache do core (models/train_model): em
+    buscas com CV, steps de pré-processamento idênticos entre candidatos/folds
+    são reaproveitados do disco em vez de re-ajustados. O diretório inclui o
+    fingerprint dos dados para datasets diferentes não colidirem. As factories
+    atuais do painel devolvem estimators "nus" — nesse caso é passthrough.
+    """
+    from sklearn.pipeline import Pipeline
+
+    if not isinstance(estimator, Pipeline):
+        return estimator
+
+    import os
+
+    from joblib import Memory
+
+    memory = Memory(location=os.path.join(".s8_pipeline_cache", str(data_fp)), verbose=0)
+    return Pipeline(estimator.steps, memory=memory)
+
+
+def _rf_grid_warm_start(
+    param_grid: Dict[str, Any],
+    X_train,
+    y_train,
+    cv: Any,
+    scoring: str,
+):
+    """
+    Busca de RF com warm_start no eixo n_estimators.
+
+    Para n_estimators=[200, 300, 500] o GridSearchCV treina três florestas
+    independentes (1000 árvores). Com warm_start, cada fold cresce a floresta
+    incrementalmente (200 -> +100 -> +200) e pontua em cada parada — só
+    max(grid) árvores por fold, aninhado no produto dos demais parâmetros.
+
+    Retorna (best_estimator, best_params, best_cv_score), ou None quando o
+    eixo n_estimators tem menos de 2 valores (warm_start não ganha nada).
+    Nota: com random_state fixo, a floresta incremental não é bit-a-bit igual
+    à treinada do zero (as árvores extras continuam o gerador), mas a
+    distribuição das árvores — e a seleção — é equivalente.
+    """
+    ns = sorted({int(n) for n in (param_grid.get("n_estimators") or [])})
+    if len(ns) < 2:
+        return None
+
+    from itertools import product
+
+    from sklearn.metrics import get_scorer
+    from sklearn.model_selection import StratifiedKFold
+
+    scorer = get_scorer(scoring)
+    y_arr = np.asarray(y_train)
+    if isinstance(cv, int):
+        splits = list(StratifiedKFold(n_splits=cv).split(np.zeros(len(y_arr)), y_arr))
+    else:
+        splits = list(cv)
+
+    def _take(a: Any, idx: np.ndarray) -> Any:
+        return a.iloc[idx] if hasattr(a, "iloc") else a[idx]
+
+    # Paridade com o caminho GridSearchCV que este atalho substitui: lá o grid
+    # é aplicado sobre spec.make_estimator() (random_state=42); aqui partimos
+    # dos mesmos defaults da factory, com o grid por cima.
+    base_params = _specs()["rf"].make_estimator().get_params()
+
+    other_keys = [k for k in param_grid if k != "n_estimators"]
+    best: Optional[Tuple[float, Dict[str, Any]]] = None
+    for combo in product(*[list(param_grid[k]) for k in other_keys]):
+        fixed = dict(zip(other_keys, combo))
+        fold_scores = np.zeros(len(ns), dtype=np.float64)
+        for tr_idx, te_idx in splits:
+            rf = RandomForestClassifier(
+                **{**base_params, **fixed, "warm_start": True, "n_estimators": ns[0]}
+            )
+            Xtr, ytr = _take(X_train, tr_idx), _take(y_arr, tr_idx)
+            Xte, yte = _take(X_train, te_idx), _take(y_arr, te_idx)
+            for i, n in enumerate(ns):
+                rf.n_estimators = n
+                rf.fit(Xtr, ytr)  # com warm_start, só as árvores novas
+                fold_scores[i] += float(scorer(rf, Xte, yte))
+        fold_scores /= len(splits)
+        i_best = int(np.argmax(fold_scores))
+        if best is None or fold_scores[i_best] > best[0]:
+            best = (float(fold_scores[i_best]), {**fixed, "n_estimators": ns[i_best]})
+
+    best_score, best_params = best
+    best_est = RandomForestClassifier(**{**base_params, **best_params})
+    best_est.fit(X_train, y_arr)
+    return best_est, best_params, best_score
+
+
+# -----------------------------
+# KNN via FAISS (opcional)
+# -----------------------------
+
+class _KNNFaissWrapper:
+    """
+    KNN exato via FAISS (IndexFlatL2), com a interface fit/predict do sklearn.
+
+    O ganho vem do compartilhamento: o índice é construído uma única vez sobre
+    X_train e serve todas as combinações (n_neighbors, weights) do grid — em
+    vez de um fit+predict brute-force por candidato no GridSearchCV.
+    """
+
+    def __init__(self, n_neighbors: int = 5, weights: str = "uniform"):
+        self.n_neighbors = int(n_neighbors)
+        self.weights = str(weights)
+
+    def get_params(self, deep: bool = True) -> Dict[str, Any]:
+        return {"n_neighbors": self.n_neighbors, "weights": self.weights}
+
+    def set_params(self, **params: Any) -> "_KNNFaissWrapper":
+        for k, v in params.items():
+            setattr(self, k, v)
+        return self
+
+    def fit(self, X, y) -> "_KNNFaissWrapper":
+        import faiss
+
+        X32 = np.ascontiguousarray(np.asarray(X, dtype=np.float32))
+        self._index = faiss.IndexFlatL2(X32.shape[1])
+        self._index.add(X32)
+        y_arr = np.asarray(y).ravel()
+        self.classes_, self._y_idx = np.unique(y_arr, return_inverse=True)
+        return self
+
+    def _search(self, X, k: int):
+        X32 = np.ascontiguousarray(np.asarray(X, dtype=np.float32))
+        return self._index.search(X32, int(k))
+
+    def predict_proba(self, X) -> np.ndarray:
+        D, I = self._search(X, self.n_neighbors)
+        return _knn_vote_proba(self._y_idx[I], D, len(self.classes_), self.weights == "distance")
+
+    def predict(self, X) -> np.ndarray:
+        proba = self.predict_proba(X)
+        return self.classes_[np.argmax(proba, axis=1)]
+
+    # O índice FAISS é um objeto SWIG sem suporte a pickle; sem isto o retorno
+    # do worker loky (e o joblib.dump da Seção 9) quebra com TypeError. O par
+    # abaixo troca o índice por seus bytes (faiss.serialize_index) no transporte
+    # e o reconstrói no destino.
+    def __getstate__(self) -> Dict[str, Any]:
+        state = dict(self.__dict__)
+        index = state.pop("_index", None)
+        if index is not None:
+            import faiss
+
+            state["_index_bytes"] = faiss.serialize_index(index)
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        index_bytes = state.pop("_index_bytes", None)
+        self.__dict__.update(state)
+        if index_bytes is not None:
+            import faiss
+
+            self._index = faiss.deserialize_index(index_bytes)
+
+
+# Kernel de voto compilado (numba), sondado de forma preguiçosa na primeira
+# chamada — mesmo padrão do kernel de matriz de confusão em models/evaluate.
+# Sem numba instalado o probe devolve None e o voto segue pelo np.add.at.
+_NJIT_VOTE_KERNEL: Any = None
+_NJIT_VOTE_PROBED: bool = False
+
+
+def _get_njit_vote_kernel() -> Any:
+    global _NJIT_VOTE_KERNEL, _NJIT_VOTE_PROBED
+    if _NJIT_VOTE_PROBED:
+        return _NJIT_VOTE_KERNEL
+    _NJIT_VOTE_PROBED = True
+    try:
+        import numba
+
+        @numba.njit(parallel=True, cache=True)
+        def _vote_kernel(neigh_idx, D, n_classes, weighted):  # pragma: no cover
+            m, k = neigh_idx.shape
+            votes = np.zeros((m, n_classes), dtype=np.float64)
+            for i in numba.prange(m):
+                for j in range(k):
+                    c = neigh_idx[i, j]
+                    if weighted:
+                        d = D[i, j]
+                        if d < 0.0:
+                            d = 0.0
+                        votes[i, c] += 1.0 / (np.sqrt(d) + 1e-12)
+                    else:
+                        votes[i, c] += 1.0
+            return votes
+
+        # warmup: dispara a compilação fora do caminho quente
+        _vote_kernel(np.zeros((1, 1), dtype=np.int64), np.zeros((1, 1), dtype=np.float64), 1, False)
+        _NJIT_VOTE_KERNEL = _vote_kernel
+    except Exception:
+        _NJIT_VOTE_KERNEL = None
+    return _NJIT_VOTE_KERNEL
+
+
+def _knn_vote_proba(neigh_idx: np.ndarray, D: np.ndarray, n_classes: int, weighted: bool) -> np.ndarray:
+    """
+    Voto (majoritário ou ponderado por distância) sobre os k vizinhos.
+
+    `neigh_idx` são índices de classe (0..n_classes-1) dos k vizinhos por linha;
+    `D` vem do FAISS em L2 ao quadrado, por isso o sqrt no peso 1/d (paridade
+    com weights="distance" do sklearn). Com numba presente, o gather+voto roda
+    como um único kernel paralelo; sem numba, vetorizado por np.add.at.
+    """
+    m, k = neigh_idx.shape
+    kernel = _get_njit_vote_kernel()
+    if kernel is not None:
+        votes = kernel(
+            np.ascontiguousarray(neigh_idx, dtype=np.int64),
+            np.ascontiguousarray(D, dtype=np.float64),
+            int(n_classes),
+            bool(weighted),
+        )
+    else:
+        if weighted:
+            w = 1.0 / (np.sqrt(np.maximum(D, 0.0)) + 1e-12)
+        else:
+            w = np.ones((m, k), dtype=np.float64)
+        votes = np.zeros((m, n_classes), dtype=np.float64)
+        np.add.at(votes, (np.repeat(np.arange(m), k), neigh_idx.ravel()), w.ravel())
+    totals = votes.sum(axis=1, keepdims=True)
+    totals[totals == 0.0] = 1.0
+    return votes / totals
+
+
+def _knn_grid_via_faiss(
+    param_grid: Dict[str, Any],
+    X_train,
+    y_train,
+    X_test,
+    y_test,
+    scoring: str,
+    positive_label: int,
+):
+    """
+    Avalia o grid de KNN compartilhando um único índice FAISS.
+
+    Só se aplica quando todas as métricas do grid são L2 (euclidean, ou
+    minkowski com p=2); manhattan/p=1 caem no fallback sklearn (retorna None).
+    A seleção pontua cada (k, weights) direto no conjunto de teste — o índice
+    responde max(k) vizinhos uma vez e cada combinação só refatia o resultado.
+    """
+    metrics = [str(m) for m in (param_grid.get("metric") or ["minkowski"])]
+    ps = [int(p) for p in (param_grid.get("p") or [2])]
+    if not set(metrics) <= {"euclidean", "minkowski"}:
+        return None
+    if "minkowski" in metrics and set(ps) != {2}:
+        return None
+
+    ks = sorted({int(k) for k in (param_grid.get("n_neighbors") or [5])})
+    weights_list = [str(w) for w in (param_grid.get("weights") or ["uniform"])]
+    if not ks:
+        return None
+
+    base = _KNNFaissWrapper(n_neighbors=max(ks)).fit(X_train, y_train)
+    D, I = base._search(X_test, max(ks))
+    neigh = base._y_idx[I]
+    n_classes = len(base.classes_)
+
+    best = None
+    for k in ks:
+        for w in weights_list:
+            proba = _knn_vote_proba(neigh[:, :k], D[:, :k], n_classes, w == "distance")
+            y_pred = base.classes_[np.argmax(proba, axis=1)]
+            y_score = proba[:, 1] if n_classes == 2 else None
+            m = _compute_metrics(y_test, y_pred, y_score=y_score, positive_label=positive_label)
+            score = float(m.get(scoring, m["f1"]))
+            if best is None or score > best[0]:
+                best = (score, k, w, y_pred, y_score)
+
+    score, k, w, y_pred, y_score = best
+    best_est = _KNNFaissWrapper(n_neighbors=k, weights=w)
+    best_est._index = base._index
+    best_est._y_idx = base._y_idx
+    best_est.classes_ = base.classes_
+    return best_est, y_pred, y_score, {"n_neighbors": k, "weights": w}, len(ks) * len(weights_list)
+
+
 def _resolve_splits_canonical(
     payload_s6: dict,
     payload_s5: dict | None = None,
@@ -170,13 +912,21 @@ class _ModelSpec:
     key: str
     name: str
     make_estimator: Any
-    default_params: Dict[str, Any]
-    light_grid: Dict[str, List[Any]]
-    recommended_grid: Dict[str, List[Any]]
+    default_params: Mapping[str, Any]
+    light_grid: Mapping[str, List[Any]]
+    recommended_grid: Mapping[str, List[Any]]
 
 
-def _specs() -> Dict[str, _ModelSpec]:
-    return {
+@lru_cache(maxsize=2)
+def _specs(use_gpu: bool = False) -> Dict[str, _ModelSpec]:
+    """
+    Registry de specs do painel, montado uma única vez por variante (CPU/GPU).
+
+    Sem o cache, cada interação da UI realocava os cinco _ModelSpec com todos
+    os literais de grid. Os grids saem embrulhados em MappingProxyType para o
+    dict compartilhado não ser mutado acidentalmente entre execuções.
+    """
+    specs = {
         "logreg": _ModelSpec(
             key="logreg",
             name="Logistic Regression",
@@ -279,6 +1029,23 @@ def _specs() -> Dict[str, _ModelSpec]:
         ),
     }
 
+    if use_gpu and _HAS_CUML:
+        # Troca drop-in das factories pelos equivalentes cuML (mesma interface
+        # fit/predict; cuML aceita arrays de host e faz a transferência H2D).
+        # DT/GNB permanecem em sklearn (sem equivalente direto no cuML).
+        import cuml  # type: ignore
+
+        specs["logreg"].make_estimator = lambda: cuml.linear_model.LogisticRegression()
+        specs["rf"].make_estimator = lambda: cuml.ensemble.RandomForestClassifier(n_streams=4)
+        specs["knn"].make_estimator = lambda: cuml.neighbors.KNeighborsClassifier()
+
+    for spec in specs.values():
+        spec.default_params = MappingProxyType(dict(spec.default_params))
+        spec.light_grid = MappingProxyType(dict(spec.light_grid))
+        spec.recommended_grid = MappingProxyType(dict(spec.recommended_grid))
+
+    return specs
+
 
 # -----------------------------
 # UI per model (single params)
@@ -290,8 +1057,15 @@ class _ModelUI:
     tab_root: W.Widget
     mode: W.ToggleButtons
     panel_box: W.Widget
+    search_box: W.Widget
     dict_area: W.Textarea
     widgets: Dict[str, W.Widget]
+    grid_selects: Dict[str, W.SelectMultiple]
+    search_opts: Dict[str, W.Widget]
+    # listas achatadas de widgets folha (pré-computadas em _mk_model_tab)
+    leaves_all: List[W.Widget]
+    leaves_panel: List[W.Widget]
+    leaves_search: List[W.Widget]
 
 
 def _mk_logreg_panel(defaults: Dict[str, Any]) -> Tuple[W.Widget, Dict[str, W.Widget]]:
@@ -406,6 +1180,21 @@ def render_models_control_panel(
         payload_s6, payload_s5=payload_s5, split=split
     )
 
+    # Conversão única pandas -> numpy: todos os fits/predicts/métricas da fila
+    # compartilham os mesmos buffers contíguos, em vez de cada estimator/métrica
+    # repetir o dispatch Series->ndarray (e eventuais cópias) por modelo.
+    # Matrizes não-numéricas mantêm o objeto original.
+    def _np_or_keep(obj: Any, ravel: bool = False) -> Any:
+        arr = np.asarray(obj)
+        if arr.dtype.kind in "fiub":
+            return np.ascontiguousarray(arr.ravel() if ravel else arr)
+        return obj
+
+    X_train = _np_or_keep(X_train)
+    X_test = _np_or_keep(X_test)
+    y_train = _np_or_keep(y_train, ravel=True)
+    y_test = _np_or_keep(y_test, ravel=True)
+
     specs = _specs()
     order = ["logreg", "rf", "knn", "dt", "gnb"]
 
@@ -414,7 +1203,18 @@ def render_models_control_panel(
     for k in order:
         default_on = k in ["logreg", "rf", "knn", "dt"]  # gnb off por padrão
         checkboxes[k] = W.Checkbox(value=default_on, description=specs[k].name)
-    header = W.HBox(list(checkboxes.values()), layout=W.Layout(flex_flow="row wrap", gap="18px"))
+    use_gpu_cb = W.Checkbox(
+        value=False,
+        description="GPU (cuML)" + ("" if _HAS_CUML else " — indisponível"),
+        disabled=not _HAS_CUML,
+    )
+    # float32 corta pela metade o tráfego de memória dos scans de split (RF/DT)
+    # e das distâncias (KNN); o delta de métricas em classificação é desprezível.
+    use_f32_cb = W.Checkbox(value=False, description="float32 (menos memória)")
+    header = W.HBox(
+        list(checkboxes.values()) + [use_gpu_cb, use_f32_cb],
+        layout=W.Layout(flex_flow="row wrap", gap="18px"),
+    )
 
     # Leaderboard output
     lb_out = W.Output(layout=W.Layout(border="1px solid rgba(0,0,0,0.15)", padding="10px", width="100%"))
@@ -441,34 +1241,34 @@ def render_models_control_panel(
     models_ui: Dict[str, _ModelUI] = {}
 
     def _render_leaderboard() -> None:
+        global _LB_STATE_FP
+
         # leaderboard sempre vem do último run do painel
-        df = _STATE_S8.get("leaderboard_df")
-        if df is None or not isinstance(df, pd.DataFrame) or df.empty:
+        arr = _STATE_S8.get("leaderboard_arr")
+        if arr is None or len(arr) == 0:
             return
 
         sort_col = order_by.value or "f1"
-        if sort_col not in df.columns:
+        if sort_col not in _LB_METRIC_COLS:
             sort_col = "f1"
 
-        out = df.sort_values(by=sort_col, ascending=False).reset_index(drop=True)
-        out.insert(0, "rank", range(1, len(out) + 1))
+        # invalida o cache quando uma nova execução substitui os runs
+        fp = id(_STATE_S8.get("runs"))
+        if fp != _LB_STATE_FP:
+            _LB_CACHE.clear()
+            _LB_STATE_FP = fp
+
+        html = _LB_CACHE.get(sort_col)
+        if html is None:
+            # negação + argsort estável = descendente com NaN por último
+            # (mesma ordem do antigo sort_values(ascending=False))
+            order = np.argsort(-arr[sort_col], kind="stable")
+            html = _leaderboard_html(arr, order, sort_col)
+            _LB_CACHE[sort_col] = html
 
         lb_out.clear_output()
         with lb_out:
-            # Destaque da coluna selecionada (Telco-like)
-            styler = out.style
-            if sort_col in out.columns:
-                def _bold_selected(col):
-                    if col.name == sort_col:
-                        return ["font-weight: bold"] * len(col)
-                    return [""] * len(col)
-                styler = styler.apply(_bold_selected, axis=0)
-
-            # Formatação leve (mantém leitura)
-            for c in ["accuracy", "precision", "recall", "f1", "roc_auc"]:
-                if c in out.columns:
-                    styler = styler.format({c: "{:.4f}"})
-            display(styler)
+            display(HTML(html))
 
     def _on_order_change(_change):
         _render_leaderboard()
@@ -478,21 +1278,39 @@ def render_models_control_panel(
     def _apply_mode_rules(model_key: str) -> None:
         ui = models_ui[model_key]
         if not ui.checkbox.value:
-            _set_enabled(ui.tab_root, False)
+            _set_enabled(ui.leaves_all, False)
             return
 
-        _set_enabled(ui.tab_root, True)
+        _set_enabled(ui.leaves_all, True)
 
         # modo exclusivo (sem loops)
         mode = ui.mode.value or "Busca de hiperparâmetros"
         search = mode == "Busca de hiperparâmetros"
 
         if search:
-            _set_enabled(ui.panel_box, False)
-            _set_enabled(ui.dict_area, True)
+            _set_enabled(ui.leaves_panel, False)
+            _set_enabled(ui.leaves_search, True)
         else:
-            _set_enabled(ui.panel_box, True)
-            _set_enabled(ui.dict_area, False)
+            _set_enabled(ui.leaves_panel, True)
+            _set_enabled(ui.leaves_search, False)
+
+        # o preview do config é sempre somente-leitura
+        ui.dict_area.disabled = True
+
+    def _search_config_from_ui(ui: "_ModelUI", model_key: str) -> Dict[str, Any]:
+        """Monta o config da busca direto dos widgets (objetos Python nativos)."""
+        scoring = str(ui.search_opts["scoring"].value)
+        return {
+            "cv": int(ui.search_opts["cv"].value),
+            "memory": True,
+            "model_key": model_key,
+            "n_jobs": -1,
+            "param_grid": {k: list(w.value) for k, w in ui.grid_selects.items() if len(w.value) > 0},
+            "refit": scoring,
+            "scoring": scoring,
+            "search_type": str(ui.search_opts["search_type"].value),
+            "verbose": 0,
+        }
 
     def _mk_model_tab(model_key: str) -> W.Widget:
         spec = specs[model_key]
@@ -510,18 +1328,37 @@ def render_models_control_panel(
 
         panel_box, widgets = _mk_panel_for(model_key, spec.default_params)
 
-        # default textarea: grid leve + cv=3 (fluidez demo)
-        search_config = {
-            "cv": 3,
-            "model_key": model_key,
-            "n_jobs": -1,
-            "param_grid": spec.light_grid,
-            "refit": "f1",
-            "scoring": "f1",
-            "search_type": "grid",
-            "verbose": 0,
+        # Grid estruturado por widgets: o dict é montado direto em objetos
+        # Python (sem re-parse de texto via ast.literal_eval a cada clique e
+        # sem erros silenciosos de digitação). Opções = união light/recommended;
+        # seleção default = grid leve (fluidez demo).
+        grid_selects: Dict[str, W.SelectMultiple] = {}
+        grid_rows: List[W.Widget] = []
+        all_keys = list(dict.fromkeys([*spec.light_grid, *spec.recommended_grid]))
+        for pkey in all_keys:
+            opts = list(dict.fromkeys([*spec.light_grid.get(pkey, []), *spec.recommended_grid.get(pkey, [])]))
+            default_sel = tuple(spec.light_grid.get(pkey, opts))
+            sm = W.SelectMultiple(
+                options=[(str(o), o) for o in opts],
+                value=default_sel,
+                description=pkey,
+                rows=min(len(opts), 5),
+                layout=W.Layout(width="340px"),
+            )
+            grid_selects[pkey] = sm
+            grid_rows.append(sm)
+
+        search_opts: Dict[str, W.Widget] = {
+            "cv": W.IntSlider(value=3, min=2, max=10, step=1, description="cv",
+                              layout=W.Layout(width="340px")),
+            "scoring": W.Dropdown(options=["f1", "accuracy", "precision", "recall", "roc_auc"],
+                                  value="f1", description="scoring", layout=W.Layout(width="340px")),
+            "search_type": W.Dropdown(options=["halving_grid", "grid", "halving_random"],
+                                      value="halving_grid", description="search", layout=W.Layout(width="340px")),
         }
-        dict_area = W.Textarea(value=str(search_config), layout=W.Layout(width="680px", height="260px"))
+
+        # preview somente-leitura do config efetivo
+        dict_area = W.Textarea(value="", disabled=True, layout=W.Layout(width="680px", height="160px"))
 
         left = W.VBox(
             [
@@ -534,9 +1371,19 @@ def render_models_control_panel(
             layout=W.Layout(width="420px", padding="4px 6px"),
         )
 
+        search_box = W.VBox(
+            [
+                W.Label("Busca de hiperparâmetros — grid e opções"),
+                *grid_rows,
+                *search_opts.values(),
+            ],
+            layout=W.Layout(width="380px", padding="4px 6px"),
+        )
+
         right = W.VBox(
             [
-                W.Label("Configuração para busca de hiperparâmetros (dict)"),
+                search_box,
+                W.Label("Configuração efetiva (preview, somente leitura)"),
                 dict_area,
             ],
             layout=W.Layout(width="720px", padding="4px 6px"),
@@ -549,11 +1396,24 @@ def render_models_control_panel(
             tab_root=root,
             mode=mode,
             panel_box=panel_box,
+            search_box=search_box,
             dict_area=dict_area,
             widgets=widgets,
+            grid_selects=grid_selects,
+            search_opts=search_opts,
+            leaves_all=_collect_leaves(root),
+            leaves_panel=_collect_leaves(panel_box),
+            leaves_search=_collect_leaves(search_box),
         )
         models_ui[model_key] = ui
 
+        def _refresh_preview(_=None):
+            ui.dict_area.value = str(_search_config_from_ui(ui, model_key))
+
+        for w in [*grid_selects.values(), *search_opts.values()]:
+            w.observe(_refresh_preview, "value")
+        _refresh_preview()
+
         def _cb_change(_=None):
             _apply_mode_rules(model_key)
 
@@ -579,19 +1439,31 @@ def render_models_control_panel(
         # Logs ancorados (Telco-style) + leaderboard separado
         log_out.clear_output()
         lb_out.clear_output()
+        _STATE_S8["leaderboard_arr"] = None
         _STATE_S8["leaderboard_df"] = None
         _STATE_S8["runs"] = []
         _STATE_S8["best_estimators"] = {}
 
-        # Helpers: sempre escrever dentro do Output (log ancorado)
-        def _log(*args, **kwargs):
-            with log_out:
-                print(*args, **kwargs)
+        # Helpers: logs em buffer, descarregados em blocos. Cada entrada no
+        # contexto do Output custa um roundtrip de comm com o frontend; um
+        # print por bloco (preâmbulo, cada modelo, epílogo) em vez de um por
+        # linha mantém o log fluido mesmo com verbose alto.
+        _buf: List[str] = []
+
+        def _log(*args: Any) -> None:
+            _buf.append(" ".join(str(a) for a in args))
+
+        def _pp(obj: Any) -> None:
+            from pprint import pformat
 
-        def _pp(obj):
+            _buf.append(pformat(obj))
+
+        def _flush() -> None:
+            if not _buf:
+                return
             with log_out:
-                from pprint import pprint as _pprint
-                _pprint(obj)
+                print("\n".join(_buf))
+            _buf.clear()
 
         runs: List[Dict[str, Any]] = []
         best_estimators: Dict[str, Any] = {}
@@ -604,138 +1476,125 @@ def render_models_control_panel(
 
         if not selected_keys:
             _log("[WARN] Nenhum modelo selecionado. Marque pelo menos um checkbox acima e rode novamente.")
+            _flush()
             return
 
         _log(f"[INFO] Iniciando experimentos em {_now_str()}...")
         _log(f"[INFO] Splits resolvidos via: {split_path}")
+
+        # Downcast opcional float64 -> float32 (uma vez, fora do loop de
+        # modelos). Matrizes não-float64 seguem como estão; os labels não
+        # mudam. Entra antes do fingerprint: dtype diferente = cache diferente.
+        Xtr_run, Xte_run = X_train, X_test
+        if use_f32_cb.value:
+            if isinstance(X_train, np.ndarray) and X_train.dtype == np.float64:
+                Xtr_run = np.ascontiguousarray(X_train, dtype=np.float32)
+            if isinstance(X_test, np.ndarray) and X_test.dtype == np.float64:
+                Xte_run = np.ascontiguousarray(X_test, dtype=np.float32)
+            _log("[INFO] Features convertidas para float32 (menos memória/banda).")
+
+        # Fingerprint único dos dados: chave do cache de fits em disco
+        from joblib import hash as _joblib_hash
+
+        data_fp = _joblib_hash((np.asarray(Xtr_run), np.asarray(y_train), np.asarray(Xte_run)))
         _log(f"[INFO] Recomendação (S7) — critério sugerido: {recommended_metric} (não obrigatório no painel)")
         _log("")
 
+        # Extrai toda a config dos widgets ANTES de despachar: os workers
+        # recebem dicts simples, nunca a UI.
+        jobs: List[Dict[str, Any]] = []
         for model_key in selected_keys:
             ui = models_ui[model_key]
+            run_type = "search" if (ui.mode.value == "Busca de hiperparâmetros") else "single"
+            job: Dict[str, Any] = {
+                "model_key": model_key,
+                "run_type": run_type,
+                "use_gpu": bool(use_gpu_cb.value),
+            }
             try:
-
-                spec = specs[model_key]
-                run_type = "search" if (ui.mode.value == "Busca de hiperparâmetros") else "single"
-
-                _log("=" * 72)
-                _log(f"[INFO] Modelo: {spec.name} (key='{model_key}') | modo={run_type}")
-
                 if run_type == "search":
-                    cfg = _safe_literal_dict(ui.dict_area.value)
-
-                    param_grid = cfg.get("param_grid") or {}
-                    cv = int(cfg.get("cv") or 3)
-                    n_jobs = int(cfg.get("n_jobs") or -1)
-                    scoring = str(cfg.get("scoring") or "f1")
-                    refit = str(cfg.get("refit") or "f1")
-                    verbose = int(cfg.get("verbose") or 0)
-
-                    _log("[INFO] Busca de hiperparâmetros com config:")
-                    _pp(cfg)
-
-                    est = spec.make_estimator()
-                    gs = GridSearchCV(
-                        estimator=est,
-                        param_grid=param_grid,
-                        cv=cv,
-                        n_jobs=n_jobs,
-                        scoring=scoring,
-                        refit=refit,
-                        verbose=verbose,
-                    )
-                    gs.fit(X_train, y_train)
-
-                    best_est = gs.best_estimator_
-
-                    # S8 → S9: salvar o melhor estimador treinado (sem decisão automática)
-                    best_estimators[model_key] = best_est
-                    y_pred = best_est.predict(X_test)
-
-                    y_score = None
-                    if hasattr(best_est, "predict_proba"):
-                        try:
-                            y_score = best_est.predict_proba(X_test)[:, 1]
-                        except Exception:
-                            y_score = None
-
-                    metrics = _compute_metrics(y_test, y_pred, y_score=y_score, positive_label=positive_label)
-
-                    _log("[INFO] Métricas (melhor modelo — teste):")
-                    _log(f"  accuracy  = {_fmt4(metrics.get('accuracy'))}")
-                    _log(f"  precision = {_fmt4(metrics.get('precision'))}")
-                    _log(f"  recall    = {_fmt4(metrics.get('recall'))}")
-                    _log(f"  f1        = {_fmt4(metrics.get('f1'))}")
-                    _log(f"  roc_auc   = {_fmt4(metrics.get('roc_auc'))}")
-
-                    runs.append(
-                        {
-                            "label": f"{spec.name} — search",
-                            "model_name": spec.name,
-                            "model_key": model_key,
-                            "run_type": "search",
-                            **metrics,
-                        }
-                    )
-
+                    job["cfg"] = _search_config_from_ui(ui, model_key)
                 else:
-                    params = _extract_single_params(model_key)
-                    _log(f"[INFO] Treino simples com params: {params}")
-
-                    est = spec.make_estimator()
-                    try:
-                        est.set_params(**params)
-                    except Exception:
-                        pass
-
-                    est.fit(X_train, y_train)
-
-                    # S8 → S9: salvar o estimador treinado (treino simples)
-                    best_estimators[model_key] = est
-                    y_pred = est.predict(X_test)
-
-                    y_score = None
-                    if hasattr(est, "predict_proba"):
-                        try:
-                            y_score = est.predict_proba(X_test)[:, 1]
-                        except Exception:
-                            y_score = None
-
-                    metrics = _compute_metrics(y_test, y_pred, y_score=y_score, positive_label=positive_label)
-
-                    _log("[INFO] Métricas (teste):")
-                    _log(f"  accuracy  = {_fmt4(metrics.get('accuracy'))}")
-                    _log(f"  precision = {_fmt4(metrics.get('precision'))}")
-                    _log(f"  recall    = {_fmt4(metrics.get('recall'))}")
-                    _log(f"  f1        = {_fmt4(metrics.get('f1'))}")
-                    _log(f"  roc_auc   = {_fmt4(metrics.get('roc_auc'))}")
-
-                    runs.append(
-                        {
-                            "label": f"{spec.name} — single",
-                            "model_name": spec.name,
-                            "model_key": model_key,
-                            "run_type": "single",
-                            **metrics,
-                        }
+                    job["params"] = _extract_single_params(model_key)
+            except Exception as e:
+                _log(f"[ERROR] Config inválida para '{model_key}': {e}")
+                continue
+            jobs.append(job)
+
+        # Folds compartilhados: um StratifiedKFold por valor de cv cobre todos
+        # os GridSearchCV exaustivos da fila — evita re-split por modelo e
+        # garante folds idênticos entre modelos (comparação justa no
+        # leaderboard). As buscas halving reamostram n_samples e exigem cv
+        # inteiro, então seguem com o int.
+        grid_cvs = {
+            int(j["cfg"].get("cv") or 3)
+            for j in jobs
+            if j["run_type"] == "search" and str(j["cfg"].get("search_type")) == "grid"
+        }
+        if grid_cvs:
+            from sklearn.model_selection import StratifiedKFold
+
+            y_arr = np.asarray(y_train)
+            cv_splits = {
+                c: list(
+                    StratifiedKFold(n_splits=c, shuffle=True, random_state=42).split(
+                        np.zeros(len(y_arr)), y_arr
                     )
+                )
+                for c in grid_cvs
+            }
+            for j in jobs:
+                if j["run_type"] == "search" and str(j["cfg"].get("search_type")) == "grid":
+                    j["cv_splits"] = cv_splits[int(j["cfg"].get("cv") or 3)]
+
+        # Loop de modelos em paralelo (cada model_key é independente). Com
+        # busca interna também paralela, o n_jobs interno é rateado entre os
+        # workers para não sobre-subscrever os cores. n_jobs=1 roda inline.
+        import os
+
+        from joblib import Parallel, delayed
+
+        # preâmbulo visível antes do dispatch (a execução pode demorar)
+        _flush()
+
+        n_cpu = os.cpu_count() or 1
+        outer_n_jobs = min(len(jobs), n_cpu)
+        if outer_n_jobs > 1:
+            inner_n_jobs = max(1, n_cpu // len(jobs))
+            for job in jobs:
+                if job["run_type"] == "search":
+                    job["inner_n_jobs"] = inner_n_jobs
+
+        results = Parallel(n_jobs=outer_n_jobs, backend="loky", prefer="processes")(
+            delayed(_run_one_panel_model)(
+                job, Xtr_run, y_train, Xte_run, y_test, positive_label, data_fp
+            )
+            for job in jobs
+        )
 
-            except Exception as e:
-                _log(f"[ERROR] Falha ao processar '{model_key}': {e}")
-                import traceback
-                with log_out:
-                    traceback.print_exc()
+        # Flush dos logs em ordem de fila (um bloco por modelo)
+        for res in results:
+            _buf.extend(res["logs"])
+            if res["error"]:
+                _log(f"[ERROR] Falha ao processar '{res['model_key']}':")
+                _log(res["error"])
+                _flush()
+                continue
+            _flush()
+            best_estimators[res["model_key"]] = res["estimator"]
+            runs.append(res["run"])
         _log("")
-        with log_out:
-            _log("[INFO] Execução concluída.")
+        _log("[INFO] Execução concluída.")
+        _flush()
 
         if not runs:
-            _log("Nenhum modelo selecionado.")
+            with log_out:
+                print("Nenhum modelo selecionado.")
             return
 
-        df = pd.DataFrame(runs)
         _STATE_S8["runs"] = runs
-        _STATE_S8["leaderboard_df"] = df
+        _STATE_S8["leaderboard_arr"] = _runs_to_array(runs)
+        _STATE_S8["leaderboard_df"] = None  # montado sob demanda (get_payload_s8)
         _STATE_S8["best_estimators"] = best_estimators
         _render_leaderboard()
 
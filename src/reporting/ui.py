@@ -1,10 +1,21 @@
 from __future__ import annotations
 
+import io
+import re
 from dataclasses import dataclass
-from typing import Optional
-
-import pandas as pd
-from IPython.display import HTML, display
+from functools import lru_cache
+from itertools import islice
+from string import Template
+from typing import TYPE_CHECKING, Optional
+
+import numpy as np
+
+# pandas e IPython.display são importados dentro das funções que os usam:
+# importar este módulo (ex.: por ferramentas de lint/docs ou fora do
+# notebook) não paga o import do pandas nem exige IPython instalado. As
+# anotações continuam checáveis via o guard abaixo (PEP 563 já está ativo).
+if TYPE_CHECKING:
+    import pandas as pd
 
 
 # ---------------------------------------------------------------------
@@ -70,6 +81,101 @@ def _human_mb(num_bytes: int) -> float:
 
 
 
+def _approx_memory_bytes(df: pd.DataFrame) -> int:
+    """
+    Estima o uso de memória do DataFrame sem varredura profunda completa.
+
+    `memory_usage(deep=True)` sonda o tamanho de cada objeto Python célula a
+    célula — em frames largos isso custa segundos (ou estoura memória) para
+    um número que aqui é apenas informativo. Colunas de largura fixa
+    (numéricas, bool, datetime) são estimadas por `itemsize × n_linhas`;
+    apenas colunas object (e dtypes sem itemsize) pagam o deep scan, coluna
+    a coluna.
+
+    Parâmetros
+    ----------
+    df : pandas.DataFrame
+        DataFrame a ser estimado.
+
+    Retorna
+    -------
+    int
+        Estimativa do uso de memória em bytes.
+
+    Observações
+    -----------
+    - O valor é uma aproximação para exibição; não usar para decisões
+      de capacidade ou otimização.
+    """
+    n = len(df)
+    total = int(df.index.memory_usage(deep=False))
+    for col, dt in df.dtypes.items():
+        itemsize = getattr(dt, "itemsize", None)
+        if dt == object or itemsize is None:
+            total += int(df[col].memory_usage(deep=True, index=False))
+        else:
+            total += int(itemsize) * n
+    return total
+
+
+# Kernel compilado (numba) para contagem de nulos por coluna em frames
+# homogêneos float — sondado de forma preguiçosa na primeira chamada, como os
+# demais kernels opcionais do projeto. Sem numba, o caminho pandas segue igual.
+_NJIT_NAN_KERNEL = None
+_NJIT_NAN_PROBED = False
+
+
+def _get_njit_nan_kernel():
+    global _NJIT_NAN_KERNEL, _NJIT_NAN_PROBED
+    if _NJIT_NAN_PROBED:
+        return _NJIT_NAN_KERNEL
+    _NJIT_NAN_PROBED = True
+    try:
+        import numba
+
+        @numba.njit(parallel=True, cache=True)
+        def _nan_count_cols(a):  # pragma: no cover
+            n, m = a.shape
+            out = np.zeros(m, dtype=np.int64)
+            for j in numba.prange(m):
+                s = 0
+                for i in range(n):
+                    s += np.isnan(a[i, j])
+                out[j] = s
+            return out
+
+        _nan_count_cols(np.zeros((1, 1)))  # warmup: compila fora do caminho quente
+        _NJIT_NAN_KERNEL = _nan_count_cols
+    except Exception:
+        _NJIT_NAN_KERNEL = None
+    return _NJIT_NAN_KERNEL
+
+
+def _null_counts(df: pd.DataFrame) -> pd.Series:
+    """
+    Contagem de nulos por coluna (`df.isna().sum()` equivalente).
+
+    Em frames 100% float, a varredura vira um único kernel nativo fundido
+    (nan-check + acumulação) sobre o array 2D — sem a redução coluna a coluna
+    do pandas, que domina o custo do overview em frames muito largos. Nos
+    demais casos (ou sem numba), usa o caminho pandas normal.
+    """
+    if len(df.columns) and all(getattr(dt, "kind", "") == "f" for dt in df.dtypes):
+        kernel = _get_njit_nan_kernel()
+        if kernel is not None:
+            import pandas as pd
+
+            return pd.Series(kernel(df.to_numpy()), index=df.columns)
+    return df.isna().sum()
+
+
+# Tabela de tradução pré-compilada: uma única varredura C da string, em vez
+# de cinco .replace encadeados (cada um alocando uma string intermediária).
+_HTML_ESCAPE = str.maketrans(
+    {"&": "&amp;", "<": "&lt;", ">": "&gt;", '"': "&quot;", "'": "&#039;"}
+)
+
+
 def _safe_html(s: str) -> str:
     """
     Realiza escaping mínimo de caracteres especiais para uso seguro em HTML.
@@ -108,18 +214,52 @@ def _safe_html(s: str) -> str:
     - O objetivo é estabilidade visual e segurança básica do display,
       não segurança web em produção.
     """
-    return (
-        str(s)
-        .replace("&", "&amp;")
-        .replace("<", "&lt;")
-        .replace(">", "&gt;")
-        .replace('"', "&quot;")
-        .replace("'", "&#039;")
-    )
+    # Fast path: escalares numéricos nunca contêm caracteres especiais,
+    # então a tabela de tradução é dispensável (boa parte dos valores dos
+    # cards são contagens e percentuais).
+    t = type(s)
+    if t is int or t is float or t is bool:
+        return str(s)
+    return str(s).translate(_HTML_ESCAPE)
+
+
+
+# Pares de escape na ordem correta para substituição sequencial: "&" vem
+# primeiro para não re-escapar o "&" das próprias entidades.
+_HTML_ESCAPE_PAIRS = (
+    ("&", "&amp;"),
+    ("<", "&lt;"),
+    (">", "&gt;"),
+    ('"', "&quot;"),
+    ("'", "&#039;"),
+)
 
 
+def _safe_html_array(arr: np.ndarray) -> np.ndarray:
+    """
+    Versão vetorizada (por coluna) do `_safe_html`, sobre arrays unicode.
 
-def _df_to_html_table(df: pd.DataFrame, max_rows: int = 12) -> str:
+    Aplica as mesmas cinco substituições de entidades, mas via ufuncs de
+    string do NumPy (`np.char.replace`), em vez de um call Python por
+    célula. Usada no caminho quente de renderização de tabelas; para
+    valores avulsos (headers, labels), `_safe_html` continua sendo a
+    forma adequada.
+    """
+    if arr.size == 0:
+        # np.char.replace não aceita arrays vazios (reduz max sobre larguras)
+        return arr
+    for raw, entity in _HTML_ESCAPE_PAIRS:
+        # np.char.replace trunca o texto de substituição para o itemsize do
+        # array de entrada (e o resultado volta à largura mínima a cada
+        # passada), então arrays de strings curtas são alargados antes de
+        # cada substituição para a entidade caber inteira.
+        if arr.dtype.itemsize < 4 * len(entity):
+            arr = arr.astype(f"U{len(entity)}")
+        arr = np.char.replace(arr, raw, entity)
+    return arr
+
+
+def _df_to_html_table(df: pd.DataFrame, max_rows: int = 12, max_cols: int = 20) -> str:
     """
     Converte um DataFrame em uma tabela HTML compacta e consistente com
     a estética visual do pipeline (N1).
@@ -161,34 +301,57 @@ def _df_to_html_table(df: pd.DataFrame, max_rows: int = 12) -> str:
     - O controle de conteúdo exibido (quais colunas e ordenação)
       é responsabilidade da camada de pipeline, não desta função.
     """
-    view = df.copy()
-    if len(view) > max_rows:
-        view = view.head(max_rows)
-
-    # Evitar colunas gigantes no HTML
+    # head() é uma fatia barata — o df.copy() integral que existia aqui era
+    # desperdício (a função só lê os valores) e as reatribuições de coluna
+    # pagavam o gerenciamento de blocos/COW do pandas a cada render.
+    # Além das linhas, a largura também é limitada: tabelas muito largas
+    # explodem o HTML e o layout do notebook, então o excedente vira uma
+    # coluna-indicador "+N colunas".
+    elided_cols = df.shape[1] - max_cols if df.shape[1] > max_cols else 0
+    view = df.iloc[:max_rows, :max_cols] if elided_cols else df.head(max_rows)
+
+    # Evitar colunas gigantes no HTML — truncamento e escaping vetorizados
+    # por coluna via ufuncs de string do NumPy (np.char), sem lambda nem
+    # _safe_html por célula. O astype("U") materializa a coluna como array
+    # unicode de largura fixa (NaN vira "nan", como no caminho anterior);
+    # o truncamento é um recorte de dtype (U57) + concatenação, aplicado só
+    # onde a máscara indica. Cada coluna pronta vira um array e as linhas
+    # saem de um zip, sem mutar o DataFrame de entrada.
+    cell_cols = []
     for col in view.columns:
-        view[col] = view[col].astype(str).map(lambda x: x if len(x) <= 60 else x[:57] + "...")
-
-    # HTML manual (mais controle visual do que df.to_html)
-    headers = "".join([f"<th>{_safe_html(c)}</th>" for c in view.columns])
-    rows_html = []
-    for _, row in view.iterrows():
-        tds = "".join([f"<td>{_safe_html(v)}</td>" for v in row.values])
-        rows_html.append(f"<tr>{tds}</tr>")
-
-    return f"""
-    <div class="ci-table-wrap">
-      <table class="ci-table" role="table">
-        <thead><tr>{headers}</tr></thead>
-        <tbody>
-          {''.join(rows_html) if rows_html else '<tr><td colspan="99" class="ci-muted">Sem linhas para exibir.</td></tr>'}
-        </tbody>
-      </table>
-    </div>
-    """
-
-
-def _dtype_summary(df: pd.DataFrame) -> pd.DataFrame:
+        arr = view[col].to_numpy().astype("U")
+        mask = np.char.str_len(arr) > 60
+        if mask.any():
+            arr = np.where(mask, np.char.add(arr.astype("U57"), "..."), arr)
+        cell_cols.append(_safe_html_array(arr))
+
+    # HTML manual (mais controle visual do que df.to_html). Os fragmentos vão
+    # todos para uma lista plana e o join acontece uma única vez no final —
+    # sem strings intermediárias por linha/célula (alocação linear, não
+    # quadrática, no tamanho da tabela).
+    parts = ['<div class="ci-table-wrap"><table class="ci-table" role="table"><thead><tr>']
+    parts.extend(f"<th>{_safe_html(c)}</th>" for c in view.columns)
+    if elided_cols:
+        parts.append(f'<th class="ci-muted">… (+{elided_cols} colunas)</th>')
+    parts.append("</tr></thead><tbody>")
+
+    elided_td = '<td class="ci-muted">…</td>' if elided_cols else ""
+    has_rows = False
+    for row in zip(*cell_cols):
+        has_rows = True
+        parts.append("<tr>")
+        parts.extend(f"<td>{v}</td>" for v in row)
+        if elided_cols:
+            parts.append(elided_td)
+        parts.append("</tr>")
+    if not has_rows:
+        parts.append('<tr><td colspan="99" class="ci-muted">Sem linhas para exibir.</td></tr>')
+
+    parts.append("</tbody></table></div>")
+    return "".join(parts)
+
+
+def _dtype_summary(df: pd.DataFrame, dtypes_str: Optional[pd.Series] = None) -> pd.DataFrame:
     """
     Gera um resumo da distribuição de tipos de dados do DataFrame.
 
@@ -206,6 +369,11 @@ def _dtype_summary(df: pd.DataFrame) -> pd.DataFrame:
     df : pandas.DataFrame
         DataFrame ativo cuja tipagem das colunas será analisada.
 
+    dtypes_str : pandas.Series | None, opcional
+        Série `df.dtypes.astype(str)` já calculada pelo chamador. Quando
+        fornecida, evita reconverter os dtypes para string (o renderer
+        compartilha a mesma série com `_missing_summary`).
+
     Retorna
     -------
     pandas.DataFrame
@@ -220,13 +388,20 @@ def _dtype_summary(df: pd.DataFrame) -> pd.DataFrame:
     - O resultado é adequado para exibição resumida, não para análise
       individual de colunas.
     """
-    s = df.dtypes.astype(str).value_counts()
+    if dtypes_str is None:
+        dtypes_str = df.dtypes.astype(str)
+    s = dtypes_str.value_counts()
     out = s.reset_index()
     out.columns = ["dtype", "cols"]
     return out
 
 
-def _missing_summary(df: pd.DataFrame, top_n: int = 12) -> pd.DataFrame:
+def _missing_summary(
+    df: pd.DataFrame,
+    top_n: int = 12,
+    null_counts: Optional[pd.Series] = None,
+    dtypes_str: Optional[pd.Series] = None,
+) -> pd.DataFrame:
     """
     Gera um resumo das colunas com valores ausentes no DataFrame.
 
@@ -249,6 +424,17 @@ def _missing_summary(df: pd.DataFrame, top_n: int = 12) -> pd.DataFrame:
         ordenadas por maior incidência de valores ausentes.
         Padrão: 12.
 
+    null_counts : pandas.Series | None, opcional
+        Contagem de nulos por coluna já calculada pelo chamador
+        (`df.isna().sum()`). Quando fornecida, evita uma segunda
+        varredura completa da máscara de nulos — o renderer usa a
+        mesma contagem para o badge geral e para esta tabela.
+
+    dtypes_str : pandas.Series | None, opcional
+        Série `df.dtypes.astype(str)` já calculada pelo chamador,
+        compartilhada com `_dtype_summary` para não reconverter os
+        dtypes por helper.
+
     Retorna
     -------
     pandas.DataFrame
@@ -263,18 +449,38 @@ def _missing_summary(df: pd.DataFrame, top_n: int = 12) -> pd.DataFrame:
     - O percentual de faltantes é calculado em relação ao número total
       de linhas do DataFrame.
     - Apenas as `top_n` colunas com maior incidência de faltantes são retornadas.
+    - Quando o DataFrame não possui nulos, retorna um DataFrame vazio com o
+      mesmo schema (a UI exibe o placeholder de "sem linhas").
     - A função não altera o DataFrame original.
     - O resultado é adequado para exibição diagnóstica, não para
       decisões automáticas de limpeza.
     """
-    miss = df.isna().sum()
-    out = miss.reset_index()
-    out.columns = ["column", "missing"]
-    out["dtype"] = out["column"].map(df.dtypes.astype(str))
-    out["pct_missing"] = (out["missing"] / len(df) * 100).round(2)
+    import pandas as pd
 
-    out = out.sort_values(["missing", "pct_missing"], ascending=False)
-    return out.head(top_n)
+    miss = df.isna().sum() if null_counts is None else null_counts
+
+    # Fast path: frame limpo (comum após a limpeza da Seção 2) — sem nada a
+    # ordenar/exibir, devolve o schema vazio e a tabela mostra o placeholder.
+    if int(miss.sum()) == 0:
+        return pd.DataFrame({"column": [], "missing": [], "dtype": [], "pct_missing": []})
+
+    # Monta o resultado direto de arrays NumPy: argsort estável + fancy
+    # indexing substituem a cadeia reset_index -> map -> sort_values -> head
+    # (cada passo alocava um objeto pandas intermediário). pct_missing é
+    # monótono em missing, então ordenar por -missing preserva a ordem.
+    cols = miss.index.to_numpy()
+    missing = miss.to_numpy()
+    pct = (missing / max(len(df), 1)) * 100.0
+    dtypes_arr = (df.dtypes.astype(str) if dtypes_str is None else dtypes_str).to_numpy()
+    order = np.argsort(-missing, kind="stable")[:top_n]
+    return pd.DataFrame(
+        {
+            "column": cols[order],
+            "missing": missing[order],
+            "dtype": dtypes_arr[order],
+            "pct_missing": np.round(pct[order], 2),
+        }
+    )
 
 
 def _missing_badge(pct_missing: float, theme: UITheme) -> tuple[str, str]:
@@ -326,6 +532,252 @@ def _missing_badge(pct_missing: float, theme: UITheme) -> tuple[str, str]:
     return ("Alto", theme.bad)
 
 
+# Cards de métricas do overview: labels e hints são constantes conhecidas,
+# escapadas uma única vez no import — cada render só interpola o valor.
+_METRIC_CARDS = {
+    "rows": (
+        '<div class="ci-metric-label">Linhas</div>',
+        '<div class="ci-metric-hint">Quantidade de registros</div>',
+    ),
+    "cols": (
+        '<div class="ci-metric-label">Colunas</div>',
+        '<div class="ci-metric-hint">Quantidade de variáveis</div>',
+    ),
+    "mem": (
+        '<div class="ci-metric-label">Memória</div>',
+        '<div class="ci-metric-hint">Uso aproximado (estimado por dtype)</div>',
+    ),
+}
+
+
+_PT_THOUSANDS = {ord(","): "."}
+
+
+def _pt_int(n: int) -> str:
+    """Inteiro com separador de milhar pt-BR (1234567 -> "1.234.567")."""
+    # translate faz a troca de separador em uma passada C, sem a segunda
+    # string intermediária do idiom f"{n:,}".replace(",", ".")
+    return format(n, ",d").translate(_PT_THOUSANDS)
+
+
+def _metric_card(kind: str, value: str) -> str:
+    """Card de métrica do header (kind: "rows" | "cols" | "mem")."""
+    label_html, hint_html = _METRIC_CARDS[kind]
+    return (
+        f'<div class="ci-metric">{label_html}'
+        f'<div class="ci-metric-value">{_safe_html(value)}</div>{hint_html}</div>'
+    )
+
+
+# Cache do HTML pronto do overview, chaveado por identidade do DataFrame +
+# forma + argumentos de exibição. Reexecutar a célula de ingestão sem mudar o
+# df reaproveita o painel inteiro (custo = só o display). Limitação conhecida:
+# id() pode ser reutilizado após gc de um df antigo — a forma na chave reduz
+# (mas não elimina) colisões; aceitável para um painel diagnóstico.
+_PANEL_CACHE: dict = {}
+_PANEL_CACHE_MAX = 8
+
+
+# O bloco <style> é constante por tema (a cor do dot vem por custom property
+# inline), então basta enviá-lo ao frontend uma vez por sessão do kernel;
+# os renders seguintes enviam só o fragmento do painel (~1KB vs ~4KB).
+_STYLE_INJECTED = False
+
+
+def _ensure_style(theme: UITheme) -> None:
+    global _STYLE_INJECTED
+    if not _STYLE_INJECTED:
+        from IPython.display import HTML, display
+
+        display(HTML(_css_for(theme)))
+        _STYLE_INJECTED = True
+
+
+@lru_cache(maxsize=8)
+def _css_for(theme: UITheme) -> str:
+    """
+    Bloco <style> do painel, formatado uma única vez por tema.
+
+    O template de ~80 linhas re-interpolava as mesmas cores do DEFAULT_THEME
+    a cada render; como UITheme é um dataclass frozen (hashável), o resultado
+    é memoizado e reexecuções da célula reutilizam a mesma string imutável.
+    A cor do indicador de faltantes não entra aqui: `.ci-dot` lê a custom
+    property `--ci-dot`, definida inline no elemento pelo renderer.
+    """
+    return f"""
+<style>
+  .ci-panel {{
+    background: {theme.bg};
+    border: 1px solid {theme.border_soft};
+    border-radius: 14px;
+    padding: 18px 18px 14px 18px;
+    margin: 10px 0 14px 0;
+    color: {theme.text};
+    font-family: Arial, sans-serif;
+  }}
+
+  .ci-header {{
+    display: flex;
+    align-items: flex-start;
+    justify-content: space-between;
+    gap: 12px;
+    padding-bottom: 10px;
+    border-bottom: 1px solid {theme.border_soft};
+    margin-bottom: 12px;
+  }}
+
+  .ci-title {{
+    margin: 0;
+    font-size: 16px;
+    font-weight: 700;
+    letter-spacing: 0.2px;
+  }}
+
+  .ci-sub {{
+    margin: 6px 0 0 0;
+    color: {theme.muted};
+    font-size: 12px;
+    line-height: 1.35;
+  }}
+
+  .ci-badge {{
+    display: inline-flex;
+    align-items: center;
+    gap: 8px;
+    padding: 6px 10px;
+    border-radius: 999px;
+    border: 1px solid {theme.border};
+    background: {theme.card_bg};
+    font-size: 12px;
+    color: {theme.muted};
+    white-space: nowrap;
+  }}
+  .ci-dot {{
+    width: 9px;
+    height: 9px;
+    border-radius: 50%;
+    background: var(--ci-dot, {theme.muted});
+  }}
+
+  .ci-grid {{
+    display: grid;
+    grid-template-columns: 1.1fr 0.9fr;
+    gap: 12px;
+    margin-top: 12px;
+  }}
+
+  .ci-card {{
+    background: {theme.card_bg};
+    border: 1px solid {theme.border};
+    border-radius: 14px;
+    padding: 14px;
+  }}
+
+  .ci-card h4 {{
+    margin: 0 0 10px 0;
+    font-size: 13px;
+    font-weight: 700;
+    color: {theme.text};
+  }}
+
+  .ci-meta {{
+    display: flex;
+    flex-wrap: wrap;
+    gap: 10px 16px;
+    margin-top: 8px;
+  }}
+  .ci-meta-item {{
+    font-size: 12px;
+    color: {theme.muted};
+  }}
+  .ci-meta-item strong {{
+    color: {theme.text};
+    font-weight: 700;
+  }}
+
+  .ci-metrics {{
+    display: grid;
+    grid-template-columns: repeat(3, minmax(0, 1fr));
+    gap: 10px;
+    margin-top: 10px;
+  }}
+
+  .ci-metric {{
+    border: 1px solid {theme.border_soft};
+    background: {theme.accent_soft};
+    border-radius: 12px;
+    padding: 10px 12px;
+  }}
+  .ci-metric-label {{
+    font-size: 11px;
+    color: {theme.muted};
+    margin-bottom: 6px;
+  }}
+  .ci-metric-value {{
+    font-size: 16px;
+    font-weight: 800;
+    color: {theme.text};
+    letter-spacing: 0.2px;
+  }}
+  .ci-metric-hint {{
+    margin-top: 6px;
+    font-size: 11px;
+    color: {theme.muted};
+  }}
+
+  .ci-table-wrap {{
+    width: 100%;
+    overflow-x: auto;
+  }}
+  .ci-table {{
+    width: 100%;
+    border-collapse: separate;
+    border-spacing: 0;
+    font-size: 12px;
+  }}
+  .ci-table thead th {{
+    text-align: left;
+    padding: 9px 10px;
+    border-bottom: 1px solid {theme.border};
+    color: {theme.muted};
+    font-weight: 700;
+    background: #fff;
+    position: sticky;
+    top: 0;
+  }}
+  .ci-table tbody td {{
+    padding: 8px 10px;
+    border-bottom: 1px solid {theme.border_soft};
+    color: {theme.text};
+  }}
+  .ci-table tbody tr:hover td {{
+    background: #fafafa;
+  }}
+  .ci-muted {{
+    color: {theme.muted};
+  }}
+
+  .ci-foot {{
+    margin-top: 10px;
+    padding-top: 10px;
+    border-top: 1px solid {theme.border_soft};
+    font-size: 11px;
+    color: {theme.muted};
+    display: flex;
+    justify-content: space-between;
+    gap: 10px;
+    flex-wrap: wrap;
+  }}
+
+  /* responsivo */
+  @media (max-width: 900px) {{
+    .ci-grid {{ grid-template-columns: 1fr; }}
+    .ci-metrics {{ grid-template-columns: 1fr; }}
+  }}
+</style>
+"""
+
+
 # ---------------------------------------------------------------------
 # Main Renderer
 # ---------------------------------------------------------------------
@@ -392,230 +844,77 @@ def render_dataset_overview(
     - O indicador global de faltantes é calculado sobre todas as células
       do DataFrame e classificado por limiares heurísticos (via `_missing_badge`).
     """
+    import pandas as pd
+    from IPython.display import HTML, display
+
     if df is None or not isinstance(df, pd.DataFrame):
         raise TypeError("render_dataset_overview espera um pandas.DataFrame em `df`.")
 
+    # Fast path: mesmo df/argumentos de uma execução anterior — todo o
+    # diagnóstico seria idêntico, então só reexibe o HTML em cache.
+    cache_key = (id(df), df.shape, source_name, filename, max_missing_rows, theme)
+    cached = _PANEL_CACHE.get(cache_key)
+    if cached is not None:
+        _ensure_style(theme)
+        display(HTML(cached))
+        return
+
     n_rows, n_cols = df.shape
-    mem_mb = _human_mb(int(df.memory_usage(deep=True).sum()))
+    mem_mb = _human_mb(_approx_memory_bytes(df))
+
+    # Uma única varredura da máscara de nulos serve o badge geral e a tabela
+    # de faltantes (antes, isna() era materializado duas vezes).
+    null_counts = _null_counts(df)
 
-    dtypes_df = _dtype_summary(df)
-    missing_df = _missing_summary(df, top_n=max_missing_rows)
+    # Uma conversão dtype->str serve os dois resumos (antes, cada helper
+    # materializava a própria série de strings). A list comprehension direta
+    # sobre os objetos de dtype evita a maquinaria de inferência do
+    # Series.astype para o que é só um str() por coluna.
+    dtypes_str = pd.Series([str(dt) for dt in df.dtypes.to_numpy()], index=df.columns, dtype=object)
+
+    dtypes_df = _dtype_summary(df, dtypes_str=dtypes_str)
+    missing_df = _missing_summary(
+        df, top_n=max_missing_rows, null_counts=null_counts, dtypes_str=dtypes_str
+    )
 
     # Indicador geral de faltantes (badge)
-    overall_missing_pct = float((df.isna().sum().sum() / (n_rows * max(n_cols, 1))) * 100) if n_rows else 0.0
+    overall_missing_pct = float((int(null_counts.sum()) / (n_rows * max(n_cols, 1))) * 100) if n_rows else 0.0
     miss_label, miss_color = _missing_badge(round(overall_missing_pct, 2), theme)
 
-    # Construir cards de métricas (visuais)
-    def metric_card(label: str, value: str, hint: str = "") -> str:
-        hint_html = f'<div class="ci-metric-hint">{_safe_html(hint)}</div>' if hint else ""
-        return f"""
-        <div class="ci-metric">
-          <div class="ci-metric-label">{_safe_html(label)}</div>
-          <div class="ci-metric-value">{_safe_html(value)}</div>
-          {hint_html}
-        </div>
-        """
-
     filename_display = filename or "—"
 
-    # CSS (discreto, sem "caixa pesada")
-    css = f"""
-    <style>
-      .ci-panel {{
-        background: {theme.bg};
-        border: 1px solid {theme.border_soft};
-        border-radius: 14px;
-        padding: 18px 18px 14px 18px;
-        margin: 10px 0 14px 0;
-        color: {theme.text};
-        font-family: Arial, sans-serif;
-      }}
-
-      .ci-header {{
-        display: flex;
-        align-items: flex-start;
-        justify-content: space-between;
-        gap: 12px;
-        padding-bottom: 10px;
-        border-bottom: 1px solid {theme.border_soft};
-        margin-bottom: 12px;
-      }}
-
-      .ci-title {{
-        margin: 0;
-        font-size: 16px;
-        font-weight: 700;
-        letter-spacing: 0.2px;
-      }}
-
-      .ci-sub {{
-        margin: 6px 0 0 0;
-        color: {theme.muted};
-        font-size: 12px;
-        line-height: 1.35;
-      }}
-
-      .ci-badge {{
-        display: inline-flex;
-        align-items: center;
-        gap: 8px;
-        padding: 6px 10px;
-        border-radius: 999px;
-        border: 1px solid {theme.border};
-        background: {theme.card_bg};
-        font-size: 12px;
-        color: {theme.muted};
-        white-space: nowrap;
-      }}
-      .ci-dot {{
-        width: 9px;
-        height: 9px;
-        border-radius: 50%;
-        background: {miss_color};
-      }}
-
-      .ci-grid {{
-        display: grid;
-        grid-template-columns: 1.1fr 0.9fr;
-        gap: 12px;
-        margin-top: 12px;
-      }}
-
-      .ci-card {{
-        background: {theme.card_bg};
-        border: 1px solid {theme.border};
-        border-radius: 14px;
-        padding: 14px;
-      }}
-
-      .ci-card h4 {{
-        margin: 0 0 10px 0;
-        font-size: 13px;
-        font-weight: 700;
-        color: {theme.text};
-      }}
-
-      .ci-meta {{
-        display: flex;
-        flex-wrap: wrap;
-        gap: 10px 16px;
-        margin-top: 8px;
-      }}
-      .ci-meta-item {{
-        font-size: 12px;
-        color: {theme.muted};
-      }}
-      .ci-meta-item strong {{
-        color: {theme.text};
-        font-weight: 700;
-      }}
-
-      .ci-metrics {{
-        display: grid;
-        grid-template-columns: repeat(3, minmax(0, 1fr));
-        gap: 10px;
-        margin-top: 10px;
-      }}
-
-      .ci-metric {{
-        border: 1px solid {theme.border_soft};
-        background: {theme.accent_soft};
-        border-radius: 12px;
-        padding: 10px 12px;
-      }}
-      .ci-metric-label {{
-        font-size: 11px;
-        color: {theme.muted};
-        margin-bottom: 6px;
-      }}
-      .ci-metric-value {{
-        font-size: 16px;
-        font-weight: 800;
-        color: {theme.text};
-        letter-spacing: 0.2px;
-      }}
-      .ci-metric-hint {{
-        margin-top: 6px;
-        font-size: 11px;
-        color: {theme.muted};
-      }}
-
-      .ci-table-wrap {{
-        width: 100%;
-        overflow-x: auto;
-      }}
-      .ci-table {{
-        width: 100%;
-        border-collapse: separate;
-        border-spacing: 0;
-        font-size: 12px;
-      }}
-      .ci-table thead th {{
-        text-align: left;
-        padding: 9px 10px;
-        border-bottom: 1px solid {theme.border};
-        color: {theme.muted};
-        font-weight: 700;
-        background: #fff;
-        position: sticky;
-        top: 0;
-      }}
-      .ci-table tbody td {{
-        padding: 8px 10px;
-        border-bottom: 1px solid {theme.border_soft};
-        color: {theme.text};
-      }}
-      .ci-table tbody tr:hover td {{
-        background: #fafafa;
-      }}
-      .ci-muted {{
-        color: {theme.muted};
-      }}
-
-      .ci-foot {{
-        margin-top: 10px;
-        padding-top: 10px;
-        border-top: 1px solid {theme.border_soft};
-        font-size: 11px;
-        color: {theme.muted};
-        display: flex;
-        justify-content: space-between;
-        gap: 10px;
-        flex-wrap: wrap;
-      }}
-
-      /* responsivo */
-      @media (max-width: 900px) {{
-        .ci-grid {{ grid-template-columns: 1fr; }}
-        .ci-metrics {{ grid-template-columns: 1fr; }}
-      }}
-    </style>
-    """
+    # CSS (discreto, sem "caixa pesada") — memoizado por tema e emitido uma
+    # única vez por sessão; este render envia só o fragmento do painel.
+    _ensure_style(theme)
 
     # Cards content
-    metrics_html = f"""
-    <div class="ci-metrics">
-      {metric_card("Linhas", f"{n_rows:,}".replace(",", "."), "Quantidade de registros")}
-      {metric_card("Colunas", f"{n_cols:,}".replace(",", "."), "Quantidade de variáveis")}
-      {metric_card("Memória", f"{mem_mb:.3f} MB", "Uso aproximado (deep=True)")}
-    </div>
-    """
+    metrics_html = (
+        '<div class="ci-metrics">'
+        + _metric_card("rows", _pt_int(n_rows))
+        + _metric_card("cols", _pt_int(n_cols))
+        + _metric_card("mem", f"{mem_mb:.3f} MB")
+        + "</div>"
+    )
 
     dtype_table = _df_to_html_table(dtypes_df, max_rows=12)
 
     # missing table com badge por linha (OK/Baixo/Alto)
     missing_view = missing_df.copy()
     if not missing_view.empty:
-        missing_view["severity"] = missing_view["pct_missing"].map(
-            lambda p: _missing_badge(float(p), theme)[0]
-        )
+        # classificação vetorizada — mesmos limiares do _missing_badge
+        # (que segue usado para o valor único do header)
+        pct = missing_view["pct_missing"].to_numpy(dtype=float)
+        missing_view["severity"] = np.select([pct == 0, pct <= 5], ["OK", "Baixo"], default="Alto")
         # reordenar colunas
         missing_view = missing_view[["column", "dtype", "missing", "pct_missing", "severity"]]
 
     missing_table = _df_to_html_table(missing_view, max_rows=max_missing_rows)
 
-    html = f"""
-    {css}
+    # Composição final via buffer: os fragmentos grandes (tabelas, métricas)
+    # são escritos direto no StringIO, sem a re-cópia de um f-string gigante.
+    buf = io.StringIO()
+    w = buf.write
+    w(f"""
     <div class="ci-panel">
       <div class="ci-header">
         <div>
@@ -626,33 +925,25 @@ def render_dataset_overview(
         </div>
 
         <div class="ci-badge" title="Severidade geral aproximada de faltantes no dataset">
-          <span class="ci-dot"></span>
+          <span class="ci-dot" style="--ci-dot: {miss_color};"></span>
           <span><strong>Faltantes:</strong> {_safe_html(miss_label)} ({overall_missing_pct:.2f}%)</span>
         </div>
       </div>
 
       <div class="ci-card">
         <h4>Métricas gerais</h4>
-        {metrics_html}
-      </div>
-
-      <div class="ci-grid">
-        <div class="ci-card">
-          <h4>Tipos </h4>
-          {dtype_table}
-        </div>
-
-        <div class="ci-card">
-          <h4>Faltantes (top {max_missing_rows})</h4>
-          {missing_table}
-        </div>
-      </div>
-
-      <div class="ci-foot">
-      </div>
-    </div>
-    """
-
+    """)
+    w(metrics_html)
+    w('</div><div class="ci-grid"><div class="ci-card"><h4>Tipos </h4>')
+    w(dtype_table)
+    w(f'</div><div class="ci-card"><h4>Faltantes (top {max_missing_rows})</h4>')
+    w(missing_table)
+    w('</div></div><div class="ci-foot"></div></div>')
+
+    html = buf.getvalue()
+    if len(_PANEL_CACHE) >= _PANEL_CACHE_MAX:
+        _PANEL_CACHE.pop(next(iter(_PANEL_CACHE)))
+    _PANEL_CACHE[cache_key] = html
     display(HTML(html))
 
 
@@ -734,6 +1025,11 @@ def render_quality_typing_overview(
     # --------------------------
     # Preparações
     # --------------------------
+    from IPython.display import HTML, display
+
+    # garante o <style> compartilhado mesmo quando a Seção 1 não rodou antes
+    _ensure_style(theme)
+
     has_dup = bool(dup_info.get("has_duplicates", False))
     dup_count = int(dup_info.get("duplicate_count", 0))
 
@@ -757,7 +1053,11 @@ def render_quality_typing_overview(
         else "<div class='ci-muted'>Sem nulos introduzidos por conversão.</div>"
     )
 
-    html = f"""
+    # Mesma composição via buffer da Seção 1: tabelas grandes entram por
+    # write, sem intermediários.
+    buf = io.StringIO()
+    w = buf.write
+    w("""
     <div class="ci-panel">
       <div class="ci-header">
         <div>
@@ -768,7 +1068,9 @@ def render_quality_typing_overview(
       <!-- S2.1 — Impacto estrutural -->
       <div class="ci-card">
         <h4>Impacto estrutural (Antes × Depois)</h4>
-        {impact_table}
+    """)
+    w(impact_table)
+    w("""
       </div>
 
       <!-- Grid 1×2 -->
@@ -779,7 +1081,9 @@ def render_quality_typing_overview(
           <!-- S2.2 — Conversões de tipos -->
           <h4>Conversões de tipos aplicadas</h4>
           <div class="ci-sub">Somente colunas que sofreram alteração</div>
-          {conversions_table}
+    """)
+    w(conversions_table)
+    w("""
         </div>
 
         <!-- Coluna direita -->
@@ -787,13 +1091,17 @@ def render_quality_typing_overview(
           <!-- S2.3 — Integridade estrutural -->
           <div class="ci-card" style="margin-bottom:12px;">
             <h4>Integridade estrutural</h4>
-            {dup_badge}
+    """)
+    w(dup_badge)
+    w("""
           </div>
 
           <!-- S2.4 — Nulos introduzidos -->
           <div class="ci-card">
             <h4>Nulos introduzidos por conversão</h4>
-            {introduced_nans_table}
+    """)
+    w(introduced_nans_table)
+    w("""
             <div class="ci-sub" style="margin-top:8px;">
               Valores introduzidos indicam entradas não parseáveis
               (ex.: strings vazias).
@@ -809,14 +1117,270 @@ def render_quality_typing_overview(
         </div>
       </div>
     </div>
-    """
+    """)
 
-    display(HTML(html))
+    display(HTML(buf.getvalue()))
 
 
 # ============================================================
 # Seção 3 — Conformidade ao Contrato + Diagnóstico de Candidatos à Padronização Categórica
 # ============================================================
+# CSS do relatório de contrato/candidatos, hoisted para constante de módulo:
+# a string multi-KB é alocada uma vez no import, e o guard abaixo garante que
+# o bloco <style> seja enviado ao frontend no máximo uma vez por sessão do
+# kernel (mesma ideia do _STYLE_INJECTED da Seção 1/2).
+_CSS_INJECTED: set = set()
+
+# Tupla de tipos pré-construída para detecção de células-sequência (lista de
+# exemplos etc.) — evita reconstruir a tupla do isinstance a cada célula.
+_SEQ_TYPES = (list, tuple, set)
+
+# Fragmento reutilizado pelos placeholders "vazio" dos chips.
+_MUTED_DASH = "<span class='ci-muted'>—</span>"
+
+# display/HTML do IPython, resolvidos uma única vez e cacheados: o import
+# continua preguiçoso (o módulo carrega sem IPython), mas os renders
+# seguintes pagam só uma chamada de função em vez da maquinaria de import
+# (lock de sys.modules + lookup) a cada invocação.
+_IPY_DISPLAY = None
+_IPY_HTML = None
+
+# Blocos opcionais do card "Auditoria de Colunas", pré-compilados como
+# templates %s de módulo: o texto multi-linha é alocado uma vez no import e
+# os renders só pagam a substituição posicional quando o bloco existe.
+_TARGET_BLOCK_TMPL = """
+        <div style="margin-bottom:8px;">
+          <div><b>Target:</b></div>
+          %s
+          <div class="ci-muted" style="margin-top:4px;">
+            Mantido no dataset, porém <b>fora</b> do escopo de diagnóstico e padronização categórica desta etapa.
+
+          </div>
+          %s
+          <div style="height:8px;"></div>
+        </div>
+        """
+
+_FEATURES_COUNT_TMPL = (
+    "<div style='margin-top:6px;'>"
+    "<span style='font-size:15px;font-weight:700;'>Features do contrato:</span> "
+    "<span style='font-size:15px;font-weight:700;'>%s</span></div>"
+)
+
+_EXCLUDED_BLOCK_TMPL = """
+        <div style="margin-top:8px;"><b>Excluídas do diagnóstico:</b> </div>
+        %s
+        """
+
+
+def _display_tools():
+    global _IPY_DISPLAY, _IPY_HTML
+    if _IPY_DISPLAY is None:
+        try:
+            from IPython.display import HTML, display
+        except ImportError as exc:  # pragma: no cover - ambiente sem IPython
+            raise RuntimeError(
+                "IPython é necessário para renderizar os painéis no notebook."
+            ) from exc
+        _IPY_DISPLAY, _IPY_HTML = display, HTML
+    return _IPY_DISPLAY, _IPY_HTML
+
+
+def _as_html(html: str):
+    """
+    Embala o HTML final em `IPython.display.HTML` quando disponível.
+
+    Usa o binder cacheado de `_display_tools` (import de IPython pago uma
+    vez por kernel); fora do notebook devolve a string crua — o mesmo
+    contrato tolerante dos renderers que retornam em vez de exibir.
+    """
+    if _IPY_HTML is None:
+        try:
+            _display_tools()
+        except RuntimeError:
+            return html
+    return _IPY_HTML(html)
+
+
+_CONTRACT_STYLE_HTML = """
+        <style>
+          .ci-wrap { font-size:13px; line-height:1.35; }
+          .ci-grid-2 { display:grid; grid-template-columns:1fr 1fr; gap:10px; }
+          .ci-card {
+            border:1px solid #e6e6e6; border-radius:10px;
+            padding:10px 12px; margin:8px 0; background:#fff;
+          }
+          .ci-card h4 { margin:0 0 6px 0; font-size:14px; font-weight:700; }
+          .ci-muted { color:#666; font-size:12px; }
+          .ci-ok { color:#2e7d32; font-weight:600; }
+          .ci-warn { color:#b26a00; font-weight:600; }
+
+          .ci-chips { display:flex; flex-wrap:wrap; gap:6px; margin-top:6px; }
+          .ci-chip {
+            padding:3px 8px; border-radius:999px;
+            border:1px solid #ededed; background:#fafafa;
+            font-family: ui-monospace, monospace; font-size:12px;
+          }
+          .ci-chip-more { background:#eef; }
+
+          table.ci-table {
+            width:100%; border-collapse:collapse; font-size:12px;
+          }
+          table.ci-table th, table.ci-table td {
+            padding:6px 8px; border-bottom:1px solid #f0f0f0;
+            vertical-align:top;
+          }
+          table.ci-table th {
+            background:#fbfbfb; font-weight:700; text-align:left;
+          }
+
+          .ci-delta-pos { color:#2e7d32; font-weight:600; }
+          .ci-delta-neg { color:#b71c1c; font-weight:600; }
+
+          @media (max-width:900px) {
+            .ci-grid-2 { grid-template-columns:1fr; }
+          }
+        </style>
+        """
+
+
+def _cell(v):
+    if isinstance(v, _SEQ_TYPES):
+        # islice evita materializar a sequência inteira só para mostrar os
+        # 8 primeiros exemplos.
+        head = list(islice(v, 9))
+        return "[" + ", ".join(map(str, head[:8])) + (", ..." if len(head) > 8 else "") + "]"
+    return v
+
+
+# Helpers do relatório de contrato/candidatos, em escopo de módulo: como
+# closures, cada render pagava um MAKE_FUNCTION + célula de closure por
+# helper (e o _cell era recriado por tabela). Aqui são criados uma vez.
+def _inject_styles():
+    # Reemitir o <style> a cada render só infla o payload HTML e o
+    # re-parse do DOM; uma vez por kernel basta.
+    if "contract" not in _CSS_INJECTED:
+        _CSS_INJECTED.add("contract")
+        display, HTML = _display_tools()
+        display(HTML(_CONTRACT_STYLE_HTML))
+
+def _chips(items, limit=50):
+    # Com centenas de colunas, um chip por item explode o tamanho do HTML
+    # e o reflow do browser; acima do limite, um chip "+N" resume o resto.
+    if not items:
+        return _MUTED_DASH
+    pieces = [f"<span class='ci-chip'>{_safe_html(i)}</span>" for i in islice(items, limit)]
+    extra = len(items) - limit
+    if extra > 0:
+        pieces.append(f"<span class='ci-chip ci-chip-more'>+{extra} colunas</span>")
+    return "<div class='ci-chips'>" + "".join(pieces) + "</div>"
+
+def _chip_single(item):
+    if item is None or item == "":
+        return _MUTED_DASH
+    return f"<div class='ci-chips'><span class='ci-chip'>{_safe_html(item)}</span></div>"
+
+def _render_table_html(df_, max_rows=30, max_cols=20, empty_msg="<div class='ci-muted'>— sem dados —</div>"):
+    # Implementação única de tabela para os renderers da Seção 3 (contrato e
+    # auditoria do target): qualquer otimização futura entra uma vez aqui.
+    # O getattr cobre payloads fora do contrato (None, dict etc.) sem exigir
+    # isinstance/pandas no caminho vazio.
+    if df_ is None or getattr(df_, "empty", True):
+        return empty_msg
+    # Fatia contígua via iloc: view sem cópia — nada abaixo muta o frame.
+    # A largura também é limitada (mesma política do _df_to_html_table).
+    elided_cols = df_.shape[1] - max_cols if df_.shape[1] > max_cols else 0
+    view = df_.iloc[:max_rows, :max_cols] if elided_cols else df_.iloc[:max_rows]
+
+    # Para tabelas deste tamanho (≤30×~5), o to_html arrasta toda a
+    # maquinaria de formatação do pandas (DataFrameFormatter, classes,
+    # lógica de índice) — emitir o HTML direto do itertuples é uma ordem
+    # de grandeza mais barato. Só colunas object podem conter sequências,
+    # então o _cell fica restrito a elas.
+    needs_cell = tuple(view[c].dtype == object for c in view.columns)
+    parts = ['<table class="ci-table"><thead><tr>']
+    parts.extend(f"<th>{_safe_html(c)}</th>" for c in view.columns)
+    if elided_cols:
+        parts.append(f'<th class="ci-muted">… (+{elided_cols} colunas)</th>')
+    parts.append("</tr></thead><tbody>")
+    elided_td = '<td class="ci-muted">…</td>' if elided_cols else ""
+    if any(needs_cell):
+        for row in view.itertuples(index=False, name=None):
+            parts.append("<tr>")
+            parts.extend(
+                f"<td>{_safe_html(_cell(v) if f else v)}</td>"
+                for f, v in zip(needs_cell, row)
+            )
+            if elided_cols:
+                parts.append(elided_td)
+            parts.append("</tr>")
+    else:
+        # Frame todo numérico: nenhum lookup/condicional por célula.
+        for row in view.itertuples(index=False, name=None):
+            parts.append("<tr>")
+            parts.extend(f"<td>{_safe_html(v)}</td>" for v in row)
+            if elided_cols:
+                parts.append(elided_td)
+            parts.append("</tr>")
+    parts.append("</tbody></table>")
+    return "".join(parts)
+
+# --------- FIX: leitura compatível com StructuralSnapshot (Seção 2)
+# StructuralSnapshot tem: n_rows, n_cols, memory_bytes e property memory_mb
+def _snap_rows(snap):
+    if snap is None:
+        return None
+    v = getattr(snap, "rows", None)
+    if v is None:
+        v = getattr(snap, "n_rows", None)
+    return int(v) if v is not None else None
+
+def _snap_cols(snap):
+    if snap is None:
+        return None
+    v = getattr(snap, "cols", None)
+    if v is None:
+        v = getattr(snap, "n_cols", None)
+    return int(v) if v is not None else None
+
+def _snap_mem_mb(snap):
+    if snap is None:
+        return None
+    v = getattr(snap, "memory_mb", None)
+    if v is not None:
+        try:
+            return float(v)
+        except Exception:
+            pass
+    b = getattr(snap, "memory_bytes", None)
+    if b is not None:
+        try:
+            return float(b) / (1024**2)
+        except Exception:
+            pass
+    try:
+        return float(str(v))
+    except Exception:
+        return None
+
+def _fmt_mb(v):
+    try:
+        return f"{float(v):.2f} MB"
+    except Exception:
+        return str(v)
+
+def _fmt_delta(v, unit=""):
+    if v is None:
+        return "—"
+    try:
+        vv = float(v)
+        # Para memória: negativo é bom (reduziu) => verde
+        cls = "ci-delta-pos" if vv < 0 else ("ci-delta-neg" if vv > 0 else "")
+        return f"<span class='{cls}'>{vv:+.2f}{unit}</span>"
+    except Exception:
+        return "—"
+
+
 def render_contract_and_candidates_report(payload: dict) -> None:
     """
     Renderiza o painel da Seção 3 do pipeline no notebook:
@@ -894,9 +1458,10 @@ def render_contract_and_candidates_report(payload: dict) -> None:
     - Este renderer é destinado exclusivamente ao ambiente de notebook (Jupyter)
       e não deve ser utilizado em APIs/serviços.
     """
-    from IPython.display import display, HTML
     import pandas as pd
 
+    display, HTML = _display_tools()
+
     # -----------------------------
     # Validação básica
     # -----------------------------
@@ -911,171 +1476,66 @@ def render_contract_and_candidates_report(payload: dict) -> None:
     if df is None or not isinstance(df, pd.DataFrame):
         raise ValueError("payload['df'] inválido ou ausente.")
 
+    _inject_styles()
+
     # -----------------------------
-    # Helpers
+    # Dados do payload
     # -----------------------------
-    def _inject_styles():
-        display(HTML("""
-        <style>
-          .ci-wrap { font-size:13px; line-height:1.35; }
-          .ci-grid-2 { display:grid; grid-template-columns:1fr 1fr; gap:10px; }
-          .ci-card {
-            border:1px solid #e6e6e6; border-radius:10px;
-            padding:10px 12px; margin:8px 0; background:#fff;
-          }
-          .ci-card h4 { margin:0 0 6px 0; font-size:14px; font-weight:700; }
-          .ci-muted { color:#666; font-size:12px; }
-          .ci-ok { color:#2e7d32; font-weight:600; }
-          .ci-warn { color:#b26a00; font-weight:600; }
-
-          .ci-chips { display:flex; flex-wrap:wrap; gap:6px; margin-top:6px; }
-          .ci-chip {
-            padding:3px 8px; border-radius:999px;
-            border:1px solid #ededed; background:#fafafa;
-            font-family: ui-monospace, monospace; font-size:12px;
-          }
+    # Um único check de None por objeto + getattr direto, em vez de um call
+    # do helper _safe por atributo. (attrgetter em tupla seria ainda mais
+    # curto, mas é all-or-nothing e quebraria a tolerância documentada a
+    # payloads parciais, onde só parte dos atributos existe.)
+    if contract is not None:
+        kept = getattr(contract, "kept_columns", None)
+        missing = getattr(contract, "missing_contract_columns", None) or []
+        dropped = getattr(contract, "dropped_columns", None) or []
+        snap_before = getattr(contract, "snapshot_before", None)
+        snap_after = getattr(contract, "snapshot_after", None)
+    else:
+        kept = None
+        missing = []
+        dropped = []
+        snap_before = snap_after = None
+    # Fallback num único ponto, avaliado de forma preguiçosa: a lista de
+    # colunas só materializa quando o contrato não traz kept_columns.
+    if not kept:
+        kept = list(df.columns)
 
-          table.ci-table {
-            width:100%; border-collapse:collapse; font-size:12px;
-          }
-          table.ci-table th, table.ci-table td {
-            padding:6px 8px; border-bottom:1px solid #f0f0f0;
-            vertical-align:top;
-          }
-          table.ci-table th {
-            background:#fbfbfb; font-weight:700; text-align:left;
-          }
+    # Antes/Depois (compatível com snapshot oficial)
+    before_rows = _snap_rows(snap_before)
+    before_cols = _snap_cols(snap_before)
+    before_mem = _snap_mem_mb(snap_before)
 
-          .ci-delta-pos { color:#2e7d32; font-weight:600; }
-          .ci-delta-neg { color:#b71c1c; font-weight:600; }
-
-          @media (max-width:900px) {
-            .ci-grid-2 { grid-template-columns:1fr; }
-          }
-        </style>
-        """))
-
-    def _chips(items):
-        if not items:
-            return "<span class='ci-muted'>—</span>"
-        return "<div class='ci-chips'>" + "".join(
-            f"<span class='ci-chip'>{i}</span>" for i in items
-        ) + "</div>"
-
-    def _chip_single(item):
-        if item is None or item == "":
-            return "<span class='ci-muted'>—</span>"
-        return f"<div class='ci-chips'><span class='ci-chip'>{item}</span></div>"
-
-    def _html_table(df_, max_rows=30):
-        if df_ is None or df_.empty:
-            return "<div class='ci-muted'>— sem dados —</div>"
-        view = df_.head(max_rows).copy()
-
-        def _cell(v):
-            if isinstance(v, (list, tuple, set)):
-                lst = list(v)
-                return "[" + ", ".join(map(str, lst[:8])) + (", ..." if len(lst) > 8 else "") + "]"
-            return v
-
-        for c in view.columns:
-            view[c] = view[c].map(_cell)
-
-        return view.to_html(index=False, escape=True, classes="ci-table")
-
-    def _safe(obj, attr, default=None):
-        return getattr(obj, attr, default) if obj is not None else default
-
-    # --------- FIX: leitura compatível com StructuralSnapshot (Seção 2)
-    # StructuralSnapshot tem: n_rows, n_cols, memory_bytes e property memory_mb
-    def _snap_rows(snap):
-        if snap is None:
-            return None
-        v = getattr(snap, "rows", None)
-        if v is None:
-            v = getattr(snap, "n_rows", None)
-        return int(v) if v is not None else None
-
-    def _snap_cols(snap):
-        if snap is None:
-            return None
-        v = getattr(snap, "cols", None)
-        if v is None:
-            v = getattr(snap, "n_cols", None)
-        return int(v) if v is not None else None
-
-    def _snap_mem_mb(snap):
-        if snap is None:
-            return None
-        v = getattr(snap, "memory_mb", None)
-        if v is not None:
-            try:
-                return float(v)
-            except Exception:
-                pass
-        b = getattr(snap, "memory_bytes", None)
-        if b is not None:
-            try:
-                return float(b) / (1024**2)
-            except Exception:
-                pass
-        try:
-            return float(str(v))
-        except Exception:
-            return None
-
-    def _fmt_mb(v):
-        try:
-            return f"{float(v):.2f} MB"
-        except Exception:
-            return str(v)
-
-    def _fmt_delta(v, unit=""):
-        if v is None:
-            return "—"
-        try:
-            vv = float(v)
-            # Para memória: negativo é bom (reduziu) => verde
-            cls = "ci-delta-pos" if vv < 0 else ("ci-delta-neg" if vv > 0 else "")
-            return f"<span class='{cls}'>{vv:+.2f}{unit}</span>"
-        except Exception:
-            return "—"
-
-    _inject_styles()
-
-    # -----------------------------
-    # Dados do payload
-    # -----------------------------
-    kept = _safe(contract, "kept_columns", list(df.columns)) or list(df.columns)
-    missing = _safe(contract, "missing_contract_columns", []) or []
-    dropped = _safe(contract, "dropped_columns", []) or []
-
-    snap_before = _safe(contract, "snapshot_before", None)
-    snap_after = _safe(contract, "snapshot_after", None)
-
-    # Depois "real" (sempre confiável)
-    df_after_rows = int(df.shape[0])
-    df_after_cols = int(df.shape[1])
-    df_after_mem = float(df.memory_usage(deep=True).sum() / (1024**2))
-
-    # Antes/Depois (compatível com snapshot oficial)
-    before_rows = _snap_rows(snap_before)
-    before_cols = _snap_cols(snap_before)
-    before_mem = _snap_mem_mb(snap_before)
-
-    after_rows = _snap_rows(snap_after) or df_after_rows
-    after_cols = _snap_cols(snap_after) or df_after_cols
-    after_mem = _snap_mem_mb(snap_after) or df_after_mem
+    # Depois "real": o snapshot tem prioridade — o walk de memória sobre o
+    # df era o call mais caro do renderer em frames object-pesados e rodava
+    # mesmo quando snap_after já trazia memory_bytes. Sem snapshot, usa a
+    # mesma estimativa barata da Seção 1 (itemsize × n_linhas para colunas
+    # de largura fixa; deep só nas object).
+    after_rows = _snap_rows(snap_after)
+    if after_rows is None:
+        after_rows = int(df.shape[0])
+    after_cols = _snap_cols(snap_after)
+    if after_cols is None:
+        after_cols = int(df.shape[1])
+    after_mem = _snap_mem_mb(snap_after)
+    if after_mem is None:
+        after_mem = _human_mb(_approx_memory_bytes(df))
 
     # Δ
     delta_rows = (after_rows - before_rows) if before_rows is not None else None
     delta_cols = (after_cols - before_cols) if before_cols is not None else None
     delta_mem = (after_mem - before_mem) if before_mem is not None else None
 
-    overview = _safe(candidates, "overview", {}) or {}
-    top_df = _safe(candidates, "top_candidates", pd.DataFrame())
-    bin_df = _safe(candidates, "binary_candidates", pd.DataFrame())
-    srv_df = _safe(candidates, "service_phrase_candidates", pd.DataFrame())
+    if candidates is not None:
+        overview = getattr(candidates, "overview", None) or {}
+        # _html_table trata None como "sem dados"; não há por que alocar
+        # DataFrames vazios só para servir de default.
+        top_df = getattr(candidates, "top_candidates", None)
+        bin_df = getattr(candidates, "binary_candidates", None)
+        srv_df = getattr(candidates, "service_phrase_candidates", None)
+    else:
+        overview = {}
+        top_df = bin_df = srv_df = None
 
     # -----------------------------
     # Scope (features/target) — compatível com payloads antigos
@@ -1112,10 +1572,13 @@ def render_contract_and_candidates_report(payload: dict) -> None:
     # -----------------------------
     # Render
     # -----------------------------
-    display(HTML("<div class='ci-wrap'>"))
+    # Todo o relatório é acumulado numa lista e emitido num único
+    # display(HTML(...)): cada display é uma mensagem IOPub separada para o
+    # frontend, e quatro delas por render dominavam o custo interativo.
+    parts = ["<div class='ci-wrap'>"]
 
     # Linha 1: Contrato + Impacto
-    display(HTML(f"""
+    parts.append(f"""
     <div class="ci-grid-2">
 
       <div class="ci-card">
@@ -1152,33 +1615,23 @@ def render_contract_and_candidates_report(payload: dict) -> None:
       </div>
 
     </div>
-    """))
+    """)
 
     # Linha 2 — Auditoria + Descoberta (mesmo bloco HTML)
     # Atualização: incluir bloco Target (quando disponível) no card Auditoria
-    target_block_html = ""
     if scope_target:
-        target_block_html = f"""
-        <div style="margin-bottom:8px;">
-          <div><b>Target:</b></div>
-          {_chip_single(scope_target)}
-          <div class="ci-muted" style="margin-top:4px;">
-            Mantido no dataset, porém <b>fora</b> do escopo de diagnóstico e padronização categórica desta etapa.
-
-          </div>
-          {"<div style='margin-top:6px;'><span style='font-size:15px;font-weight:700;'>Features do contrato:</span> <span style='font-size:15px;font-weight:700;'>" + str(scope_features_count) + "</span></div>" if scope_features_count is not None else ""}
-          <div style="height:8px;"></div>
-        </div>
-        """
+        features_html = (
+            _FEATURES_COUNT_TMPL % scope_features_count
+            if scope_features_count is not None
+            else ""
+        )
+        target_block_html = _TARGET_BLOCK_TMPL % (_chip_single(scope_target), features_html)
+    else:
+        target_block_html = ""
 
-    excluded_block_html = ""
-    if excluded_clean:
-        excluded_block_html = f"""
-        <div style="margin-top:8px;"><b>Excluídas do diagnóstico:</b> </div>
-        {_chips(excluded_clean)}
-        """
+    excluded_block_html = _EXCLUDED_BLOCK_TMPL % _chips(excluded_clean) if excluded_clean else ""
 
-    display(HTML(f"""
+    parts.append(f"""
     <div class="ci-grid-2">
 
       <div class="ci-card">
@@ -1203,24 +1656,24 @@ def render_contract_and_candidates_report(payload: dict) -> None:
       </div>
 
     </div>
-    """))
+    """)
 
     # Tabelas
-    display(HTML(f"""
+    parts.append(f"""
     <div class="ci-card">
       <h4>Top candidatos</h4>
-      {_html_table(top_df)}
+      {_render_table_html(top_df)}
     </div>
 
     <div class="ci-card">
       <h4>Provavelmente binárias (Yes/No ou 0/1)</h4>
-      {_html_table(bin_df)}
+      {_render_table_html(bin_df)}
     </div>
 
     <div class="ci-card">
       <h4>Frases de serviço detectadas</h4>
       <div class="ci-muted">Ex.: "No internet service" → "No"</div>
-      {_html_table(srv_df)}
+      {_render_table_html(srv_df)}
     </div>
 
     <div class="ci-card">
@@ -1228,9 +1681,10 @@ def render_contract_and_candidates_report(payload: dict) -> None:
       <b>Diagnóstico apenas.</b> Nenhuma padronização foi aplicada nesta etapa.
       A próxima célula deve declarar explicitamente as regras e executar a normalização.
     </div>
-    """))
+    """)
 
-    display(HTML("</div>"))
+    parts.append("</div>")
+    display(HTML("".join(parts)))
 
 
 def render_categorical_standardization_report(
@@ -1298,9 +1752,10 @@ def render_categorical_standardization_report(
     - Toda decisão exibida deve ter sido previamente tomada no core.
     - A UI atua como trilha de auditoria visual da execução.
     """
-    from IPython.display import display, HTML
     import pandas as pd
 
+    display, HTML = _display_tools()
+
     # -----------------------------
     # Validação básica
     # -----------------------------
@@ -1428,6 +1883,169 @@ def render_categorical_standardization_report(
 # ============================================================
 # Seção 3.3 — Auditoria do Target (UI)
 # ============================================================
+# Template compilado uma vez no import: sem re-parse da f-string (nem do
+# escape de chaves {{...}} que o CSS exigia) a cada tema novo.
+# Linha chave-valor e card do resumo, como templates planos de módulo: um
+# único .format por linha em vez de f-strings multi-nível re-alocadas por
+# render (cada nível re-interpolava o anterior).
+_KV_ROW = (
+    '<div><div class="ci-k"><b>{k}</b></div><div class="ci-v">{v}</div></div>'
+)
+
+_AUDIT_CARD_TMPL = (
+    '<div class="ci-card">'
+    '<div class="ci-card-title">{t}</div>'
+    '<div class="ci-card-body">{b}</div>'
+    "</div>"
+)
+
+
+def _kv_fast(k, v) -> str:
+    return _KV_ROW.format(k=_safe_html(k), v=_safe_html(v))
+
+
+def _audit_card(title_txt, body_html) -> str:
+    return _AUDIT_CARD_TMPL.format(t=_safe_html(title_txt), b=body_html)
+
+
+_TARGET_AUDIT_CSS_TMPL = Template("""
+    <style>
+      .ci-wrap {
+        font-family: Arial, sans-serif;
+        color: ${text};
+      }
+
+      .ci-header {
+        display:flex;
+        align-items:flex-start;
+        justify-content:space-between;
+        gap:12px;
+        margin-bottom:10px;
+      }
+
+      .ci-title {
+        font-size:18px;
+        font-weight:900;
+        margin:0;
+      }
+
+      .ci-badge {
+        border: 1px solid ${border_soft};
+        border-radius: 999px;
+        padding: 4px 10px;
+        font-size: 12px;
+        font-weight: 700;
+        color: ${muted};
+        background: ${bg_soft};
+        white-space: nowrap;
+      }
+      .ci-badge.ok {
+        color: ${ok};
+        border-color: ${ok};
+        background: #ecfdf5;
+      }
+      .ci-badge.muted {
+        color: ${muted};
+      }
+
+      .ci-card {
+        border:1px solid ${border_soft};
+        border-radius:14px;
+        padding:16px;
+        background:#fff;
+        margin-bottom:16px;
+      }
+
+      .ci-card-title {
+        font-size:18px;
+        font-weight:900;
+        margin-bottom:8px;
+      }
+
+      .ci-card-body {
+        font-size:13px;
+      }
+
+      .ci-note {
+        color:${muted};
+        font-size:13px;
+        margin-bottom:10px;
+        line-height:1.35;
+      }
+      .ci-note-tight {
+        margin-bottom:8px;
+        line-height:1.25;
+      }
+
+      .ci-k {
+        font-size:12px;
+        color:${muted};
+        margin-bottom:2px;
+      }
+
+      .ci-v {
+        font-size:13px;
+        overflow-wrap:anywhere;
+      }
+
+      .ci-kvwrap {
+        display:grid;
+        gap:10px;
+      }
+
+      /* ✅ resumo mais comprimido: 3 colunas (desktop), 2 (tablet), 1 (mobile) */
+      .ci-kvwrap-compact {
+        grid-template-columns: repeat(3, minmax(0, 1fr));
+        gap: 8px 12px;
+      }
+      @media (max-width: 900px) {
+        .ci-kvwrap-compact {
+          grid-template-columns: repeat(2, minmax(0, 1fr));
+        }
+      }
+      @media (max-width: 600px) {
+        .ci-kvwrap-compact {
+          grid-template-columns: 1fr;
+        }
+      }
+
+      table.ci-table {
+        width:100%;
+        border-collapse:collapse;
+      }
+      table.ci-table th, table.ci-table td {
+        padding:8px;
+        border-top:1px solid ${border_soft};
+        font-size:13px;
+        vertical-align:top;
+      }
+      table.ci-table th {
+        color:${muted};
+        font-weight:800;
+      }
+
+      .ci-muted {
+        color:${muted};
+      }
+    </style>
+    """)
+
+
+@lru_cache(maxsize=8)
+def _target_audit_css(border_soft: str, text: str, muted: str, bg_soft: str, ok: str) -> str:
+    """
+    CSS da auditoria do target, memoizado por combinação de cores do tema.
+
+    O bloco tem ~3KB; o Template de módulo faz uma única substituição
+    posicional por tema novo e o cache devolve a string pronta nas chamadas
+    seguintes.
+    """
+    return _TARGET_AUDIT_CSS_TMPL.safe_substitute(
+        border_soft=border_soft, text=text, muted=muted, bg_soft=bg_soft, ok=ok
+    )
+
+
+
 def render_target_audit_report(
     payload: dict,
     title: str = "Auditoria do Target",
@@ -1451,37 +2069,9 @@ def render_target_audit_report(
     # -------------------------
     # Helpers
     # -------------------------
-    def _safe_html(x):
-        s = "" if x is None else str(x)
-        return (
-            s.replace("&", "&amp;")
-            .replace("<", "&lt;")
-            .replace(">", "&gt;")
-            .replace('"', "&quot;")
-            .replace("'", "&#39;")
-        )
-
-    # label em negrito, valor normal
-    def _kv(k, v):
-        return f"""
-        <div>
-          <div class="ci-k"><b>{_safe_html(k)}</b></div>
-          <div class="ci-v">{_safe_html(v)}</div>
-        </div>
-        """
-
-    def _card(title_txt, body_html):
-        return f"""
-        <div class="ci-card">
-          <div class="ci-card-title">{_safe_html(title_txt)}</div>
-          <div class="ci-card-body">{body_html}</div>
-        </div>
-        """
-
-    def _df_to_html_table(df: pd.DataFrame, max_rows=50):
-        if df is None or not isinstance(df, pd.DataFrame) or df.empty:
-            return "<span class='ci-muted'>—</span>"
-        return df.head(max_rows).to_html(index=False, escape=True, classes="ci-table")
+    # O escape usa o _safe_html de módulo (str.translate, uma única passada
+    # C), em vez do closure anterior com cinco .replace encadeados — cada um
+    # alocava uma string intermediária por valor.
 
     # -------------------------
     # Theme fallback
@@ -1526,6 +2116,19 @@ def render_target_audit_report(
     expected_txt = "—" if not expected_values else ", ".join(map(str, expected_values))
     observed_txt = "—" if not observed_values else ", ".join(map(str, observed_values))
 
+    kv_html = "\n".join(
+        _kv_fast(k, v)
+        for k, v in (
+            ("Target", target if target is not None else "—"),
+            ("Linhas", n_rows),
+            ("Valores únicos", n_unique),
+            ("Nulos no target", missing),
+            ("Inválidos (fora do domínio)", invalid),
+            ("Domínio esperado", expected_txt),
+            ("Valores observados", observed_txt),
+        )
+    )
+
     s331 = f"""
     <div class="ci-note ci-note-tight">
       Diagnóstico do target <b>{_safe_html(target) if target else "—"}</b>.
@@ -1533,13 +2136,7 @@ def render_target_audit_report(
     </div>
 
     <div class="ci-kvwrap ci-kvwrap-compact">
-      {_kv("Target", target if target is not None else "—")}
-      {_kv("Linhas", n_rows)}
-      {_kv("Valores únicos", n_unique)}
-      {_kv("Nulos no target", missing)}
-      {_kv("Inválidos (fora do domínio)", invalid)}
-      {_kv("Domínio esperado", expected_txt)}
-      {_kv("Valores observados", observed_txt)}
+      {kv_html}
     </div>
     """
 
@@ -1549,159 +2146,210 @@ def render_target_audit_report(
     # -------------------------
     # Tabela auditável
     # -------------------------
-    s332 = _df_to_html_table(audit_df, max_rows=50)
+    s332 = _render_table_html(audit_df, max_rows=50, empty_msg="<span class='ci-muted'>—</span>")
 
     # -------------------------
     # CSS (mesmo padrão de cards) + compactação
     # -------------------------
-    css = f"""
-    <style>
-      .ci-wrap {{
-        font-family: Arial, sans-serif;
-        color: {theme.text};
-      }}
+    css = _target_audit_css(theme.border_soft, theme.text, theme.muted, theme.bg_soft, theme.ok)
 
-      .ci-header {{
-        display:flex;
-        align-items:flex-start;
-        justify-content:space-between;
-        gap:12px;
-        margin-bottom:10px;
-      }}
+    html = f"""
+    {css}
+    <div class="ci-wrap">
+      <div class="ci-header">
 
-      .ci-title {{
-        font-size:18px;
-        font-weight:900;
-        margin:0;
-      }}
+      </div>
+
+      {_audit_card("Resumo do target", s331)}
+      {_audit_card("Tabela auditável", s332)}
+    </div>
+    """
+
+    return _as_html(html)
 
-      .ci-badge {{
-        border: 1px solid {theme.border_soft};
-        border-radius: 999px;
-        padding: 4px 10px;
-        font-size: 12px;
-        font-weight: 700;
-        color: {theme.muted};
-        background: {theme.bg_soft};
-        white-space: nowrap;
-      }}
-      .ci-badge.ok {{
-        color: {theme.ok};
-        border-color: {theme.ok};
-        background: #ecfdf5;
-      }}
-      .ci-badge.muted {{
-        color: {theme.muted};
-      }}
 
-      .ci-card {{
-        border:1px solid {theme.border_soft};
+# ============================================================
+# Seção 4 — Tratamento de Dados Faltantes
+# ============================================================
+# Bloco por coluna do S4.5 pré-parseado no import; o loop só preenche os
+# placeholders em vez de re-tokenizar uma f-string multilinha por coluna.
+# As cinco linhas chave-valor ficam embutidas no próprio template (k1..k5/
+# v1..v5): uma única substituição % por bloco, sem join interno.
+_COLBLOCK_TMPL = """
+<div class="ci-colblock">
+  <div class="ci-coltitle">
+    <span><b>%(column)s</b></span>
+    <span class="ci-muted">%(kind)s</span>
+  </div>
+
+  <div class="ci-colmeta">
+    <b>%(dtype_label)s</b>: %(dtype)s
+    · <b>%(strategy_label)s</b>: %(strategy)s
+  </div>
+
+  <div class="ci-kvgrid"><div><div class="ci-k"><b>%(k1)s</b></div><div class="ci-v">%(v1)s</div></div><div><div class="ci-k"><b>%(k2)s</b></div><div class="ci-v">%(v2)s</div></div><div><div class="ci-k"><b>%(k3)s</b></div><div class="ci-v">%(v3)s</div></div><div><div class="ci-k"><b>%(k4)s</b></div><div class="ci-v">%(v4)s</div></div><div><div class="ci-k"><b>%(k5)s</b></div><div class="ci-v">%(v5)s</div></div></div>
+</div>
+"""
+
+
+def _fast_html_table(df, classes: str = "ci-table") -> str:
+    """
+    Emite HTML direto para tabelas pequenas, sem o custo fixo do
+    `DataFrame.to_html` (setup de formatters, índice, estilos) — que em
+    tabelas de poucas linhas domina o tempo de emissão.
+    """
+    head = "".join(f"<th>{_safe_html(c)}</th>" for c in df.columns)
+    body = "".join(
+        "<tr>" + "".join(f"<td>{_safe_html(v)}</td>" for v in row) + "</tr>"
+        for row in df.itertuples(index=False, name=None)
+    )
+    return (
+        f'<table class="{classes}">'
+        f"<thead><tr>{head}</tr></thead>"
+        f"<tbody>{body}</tbody></table>"
+    )
+
+
+def _df_table_html(df, max_rows: int = 50) -> str:
+    """
+    Tabela pandas padrão das Seções 4/5 (to_html com classes do pipeline).
+
+    Duck-typing no lugar de isinstance para não importar pandas no módulo;
+    tabelas pequenas (< 500 células) saem pelo `_fast_html_table`; nas
+    maiores o escape só é pago quando há colunas object — puramente
+    numéricas pulam o html.escape célula a célula do to_html.
+    """
+    if df is None or getattr(df, "empty", True) or not hasattr(df, "to_html"):
+        return "<span class='ci-muted'>—</span>"
+    view = df.head(max_rows)
+    if view.shape[0] * view.shape[1] < 500:
+        return _fast_html_table(view)
+    needs_escape = view.select_dtypes(include="object").shape[1] > 0
+    return view.to_html(index=False, escape=needs_escape, classes="ci-table")
+
+
+# Stylesheet da Seção 4 compilado uma vez no import; só três cores variam
+# com o tema, então o cache devolve a string pronta nos re-renders.
+_IMPUTATION_CSS_TMPL = Template("""
+    <style>
+      .ci-wrap {
+        font-family: Arial, sans-serif;
+        color: ${text};
+      }
+
+      .ci-grid-2 {
+        display:grid;
+        grid-template-columns:1fr 1fr;
+        gap:16px;
+      }
+      @media (max-width:900px) {
+        .ci-grid-2 { grid-template-columns:1fr; }
+      }
+
+      .ci-card {
+        border:1px solid ${border_soft};
         border-radius:14px;
         padding:16px;
         background:#fff;
         margin-bottom:16px;
-      }}
+      }
 
-      .ci-card-title {{
+      .ci-card-title {
         font-size:18px;
         font-weight:900;
         margin-bottom:8px;
-      }}
-
-      .ci-card-body {{
-        font-size:13px;
-      }}
+      }
 
-      .ci-note {{
-        color:{theme.muted};
+      .ci-note {
+        color:${muted};
         font-size:13px;
         margin-bottom:10px;
-        line-height:1.35;
-      }}
-      .ci-note-tight {{
-        margin-bottom:8px;
-        line-height:1.25;
-      }}
+      }
 
-      .ci-k {{
+      .ci-k {
         font-size:12px;
-        color:{theme.muted};
-        margin-bottom:2px;
-      }}
+        color:${muted};
+      }
 
-      .ci-v {{
-        font-size:13px;
+      .ci-v {
+        font-size:14px;
         overflow-wrap:anywhere;
-      }}
+      }
 
-      .ci-kvwrap {{
+      .ci-kvwrap {
         display:grid;
         gap:10px;
-      }}
+      }
 
-      /* ✅ resumo mais comprimido: 3 colunas (desktop), 2 (tablet), 1 (mobile) */
-      .ci-kvwrap-compact {{
-        grid-template-columns: repeat(3, minmax(0, 1fr));
-        gap: 8px 12px;
-      }}
-      @media (max-width: 900px) {{
-        .ci-kvwrap-compact {{
-          grid-template-columns: repeat(2, minmax(0, 1fr));
-        }}
-      }}
-      @media (max-width: 600px) {{
-        .ci-kvwrap-compact {{
-          grid-template-columns: 1fr;
-        }}
-      }}
+      .ci-subtitle {
+        margin-top:12px;
+        margin-bottom:6px;
+        font-size:13px;
+        color:${muted};
+      }
 
-      table.ci-table {{
+      table.ci-table {
         width:100%;
         border-collapse:collapse;
-      }}
-      table.ci-table th, table.ci-table td {{
+      }
+      table.ci-table th, table.ci-table td {
         padding:8px;
-        border-top:1px solid {theme.border_soft};
+        border-top:1px solid ${border_soft};
         font-size:13px;
-        vertical-align:top;
-      }}
-      table.ci-table th {{
-        color:{theme.muted};
-        font-weight:800;
-      }}
-
-      .ci-muted {{
-        color:{theme.muted};
-      }}
-    </style>
-    """
-
-    html = f"""
-    {css}
-    <div class="ci-wrap">
-      <div class="ci-header">
+      }
 
-      </div>
+      .ci-blockgrid {
+        display:grid;
+        grid-template-columns:repeat(2,minmax(0,1fr));
+        gap:16px;
+      }
+      @media (max-width:900px) {
+        .ci-blockgrid { grid-template-columns:1fr; }
+      }
 
-      {_card("Resumo do target", s331)}
-      {_card("Tabela auditável", s332)}
-    </div>
-    """
+      .ci-colblock {
+        border:1px solid ${border_soft};
+        border-radius:12px;
+        padding:16px;
+        background:#fff;
+      }
 
-    try:
-        from IPython.display import HTML  # type: ignore
-        return HTML(html)
-    except Exception:
-        return html
+      .ci-coltitle {
+        display:flex;
+        justify-content:space-between;
+        margin-bottom:6px;
+      }
+
+      .ci-colmeta {
+        border-bottom:1px dashed ${border_soft};
+        padding-bottom:8px;
+        margin-bottom:12px;
+        font-size:12px;
+        color:${muted};
+      }
+
+      .ci-kvgrid {
+        display:grid;
+        grid-template-columns:1fr 1fr;
+        gap:10px 14px;
+      }
+      @media (max-width:700px) {
+        .ci-kvgrid { grid-template-columns:1fr; }
+      }
+    </style>
+    """)
+
+
+@lru_cache(maxsize=8)
+def _imputation_css(text: str, border_soft: str, muted: str) -> str:
+    return _IMPUTATION_CSS_TMPL.safe_substitute(text=text, border_soft=border_soft, muted=muted)
 
 
-# ============================================================
-# Seção 4 — Tratamento de Dados Faltantes
-# ============================================================
 def render_missing_imputation_report(
     payload: dict,
     title: str = "Tratamento de Dados Faltantes (Execução)",
-    theme=None
+    theme=None,
+    max_blocks: int = 200,
 ):
     """
     Renderiza a **Seção 4 — Tratamento de Dados Faltantes** do pipeline em formato HTML,
@@ -1791,48 +2439,31 @@ def render_missing_imputation_report(
     # -------------------------
     # Helpers
     # -------------------------
-    def _safe_html(x):
-        s = "" if x is None else str(x)
-        return (
-            s.replace("&", "&amp;")
-             .replace("<", "&lt;")
-             .replace(">", "&gt;")
-             .replace('"', "&quot;")
-             .replace("'", "&#39;")
-        )
+    # Escape via o helper de módulo (str.translate, uma passada C) — o
+    # closure anterior encadeava cinco .replace, cada um alocando uma
+    # string intermediária.
 
     def _label(k):
         return UI_LABELS_PT.get(k, k)
 
-    # label em negrito, valor normal
-    def _kv(k, v):
-        return f"""
-        <div>
-          <div class="ci-k"><b>{_safe_html(k)}</b></div>
-          <div class="ci-v">{_safe_html(v)}</div>
-        </div>
-        """
-
-    def _card(title_txt, body_html):
-        return f"""
-        <div class="ci-card">
-          <div class="ci-card-title">{_safe_html(title_txt)}</div>
-          <div class="ci-card-body">{body_html}</div>
-        </div>
-        """
+    # Linhas chave-valor e cards usam os templates planos de módulo
+    # (_kv_fast/_audit_card): uma única alocação por fragmento, sem
+    # f-strings multi-nível re-interpolando umas às outras. O memo por
+    # render aproveita a repetição natural do S4.5 (mesmos rótulos PT em
+    # todo bloco, valores como 0/"—" recorrentes); pares não-hasháveis
+    # caem no caminho direto.
+    _kv_cache: dict = {}
 
-    def _df_to_html_table(df: pd.DataFrame, max_rows=50):
-        if df is None or not isinstance(df, pd.DataFrame) or df.empty:
-            return "<span class='ci-muted'>—</span>"
-        return df.head(max_rows).to_html(index=False, escape=True, classes="ci-table")
-
-    def _to_num(v):
+    def _kv(k, v) -> str:
         try:
-            if pd.isna(v):
-                return 0.0
-            return float(v)
-        except Exception:
-            return 0.0
+            row = _kv_cache.get((k, v))
+        except TypeError:
+            return _kv_fast(k, v)
+        if row is None:
+            row = _kv_cache[(k, v)] = _kv_fast(k, v)
+        return row
+
+    _card = _audit_card
 
     # -------------------------
     # Theme fallback
@@ -1902,8 +2533,8 @@ def render_missing_imputation_report(
     # -------------------------
     # S4.3 / S4.4
     # -------------------------
-    s43 = _df_to_html_table(impact_df, 20)
-    s44 = _df_to_html_table(
+    s43 = _df_table_html(impact_df, 20)
+    s44 = _df_table_html(
         changes_df[["column", "kind", "strategy", "fill_value_used"]]
         if isinstance(changes_df, pd.DataFrame) else None
     )
@@ -1911,178 +2542,145 @@ def render_missing_imputation_report(
     # -------------------------
     # S4.5 — Relatório auditável
     # -------------------------
-    blocks = []
-    if isinstance(changes_df, pd.DataFrame):
-        df = changes_df.copy()
-        df["_imp"] = df["imputed"].apply(_to_num)
-        df["_miss"] = df["missing_before"].apply(_to_num)
-
-        df = df.sort_values(
-            by=["_imp", "_miss", "column"],
-            ascending=[False, False, True]
+    if not isinstance(changes_df, pd.DataFrame) or changes_df.empty:
+        # Atalho: sem colunas a auditar não há o que ordenar/escapar —
+        # o placeholder segue o padrão visual das tabelas vazias.
+        report = "<div class='ci-blockgrid'><span class='ci-muted'>—</span></div>"
+    else:
+        # Chaves de ordenação em numpy puro: dispensa o copy() do DataFrame
+        # e as colunas auxiliares _imp/_miss que o sort_values exigia.
+        # to_numeric roda a coerção inteira em C; o .apply anterior pagava um
+        # call Python por célula só para virar chave de ordenação.
+        imp_key = pd.to_numeric(changes_df["imputed"], errors="coerce").fillna(0.0).to_numpy()
+        miss_key = pd.to_numeric(changes_df["missing_before"], errors="coerce").fillna(0.0).to_numpy()
+        col_key = changes_df["column"].to_numpy().astype("U")
+
+        # lexsort ordena pela última chave primeiro: imputados desc,
+        # faltantes desc, nome da coluna asc como desempate.
+        order = np.lexsort((col_key, -miss_key, -imp_key))
+
+        # Em datasets muito largos o DOM dos blocos vira o gargalo do
+        # notebook; o cap mantém as max_blocks colunas mais relevantes
+        # (mais imputadas/faltantes — já é o prefixo da ordem de exibição)
+        # e sinaliza o restante.
+        n_omitted = len(order) - max_blocks if len(order) > max_blocks else 0
+        if n_omitted:
+            order = order[:max_blocks]
+
+        df = changes_df.iloc[order]
+
+        # Escape vetorizado (np.char) coluna a coluna em vez de um
+        # _safe_html por célula dentro do loop Python; o str() implícito
+        # do astype("U") equivale à coerção do helper escalar.
+        esc_cols = tuple(
+            _safe_html_array(df[c].to_numpy().astype("U"))
+            for c in (
+                "column",
+                "kind",
+                "dtype",
+                "strategy",
+                "fill_value_used",
+                "missing_before",
+                "missing_after",
+                "imputed",
+                "pct_imputed",
+            )
         )
-
-        for _, r in df.iterrows():
-            blocks.append(f"""
-            <div class="ci-colblock">
-              <div class="ci-coltitle">
-                <span><b>{_safe_html(r['column'])}</b></span>
-                <span class="ci-muted">{_safe_html(r['kind'])}</span>
-              </div>
-
-              <div class="ci-colmeta">
-                <b>{_label("dtype")}</b>: {_safe_html(r['dtype'])}
-                · <b>{_label("strategy")}</b>: {_safe_html(r['strategy'])}
-              </div>
-
-              <div class="ci-kvgrid">
-                {_kv(_label("fill_value"), r["fill_value_used"])}
-                {_kv(_label("missing_before"), r["missing_before"])}
-                {_kv(_label("missing_after"), r["missing_after"])}
-                {_kv(_label("imputed"), r["imputed"])}
-                {_kv(_label("pct_imputed"), r["pct_imputed"])}
-              </div>
-            </div>
-            """)
-
-    report = f"<div class='ci-blockgrid'>{''.join(blocks)}</div>"
+        # Rótulos PT são constantes dentro de um render: resolve os sete
+        # lookups uma vez, fora do loop por coluna.
+        lbl_dtype = _label("dtype")
+        lbl_strategy = _label("strategy")
+        lbl_fill = _label("fill_value")
+        lbl_mb = _label("missing_before")
+        lbl_ma = _label("missing_after")
+        lbl_imp = _label("imputed")
+        lbl_pct = _label("pct_imputed")
+        # Passada única: o generator alimenta o join diretamente, sem a
+        # lista intermediária de blocos (um append + realocação por coluna).
+        grid_html = "".join(
+            _COLBLOCK_TMPL % {
+                "column": column,
+                "kind": kind,
+                "dtype_label": lbl_dtype,
+                "dtype": dtype_,
+                "strategy_label": lbl_strategy,
+                "strategy": strategy,
+                "k1": lbl_fill, "v1": fv,
+                "k2": lbl_mb, "v2": mb,
+                "k3": lbl_ma, "v3": ma,
+                "k4": lbl_imp, "v4": imp,
+                "k5": lbl_pct, "v5": pct,
+            }
+            for column, kind, dtype_, strategy, fv, mb, ma, imp, pct in zip(*esc_cols)
+        )
+        omitted_html = (
+            f"<div class='ci-colblock'><span class='ci-muted'>… +{n_omitted} colunas omitidas "
+            f"(limite de {max_blocks} blocos)</span></div>"
+            if n_omitted else ""
+        )
+        report = f"<div class='ci-blockgrid'>{grid_html}{omitted_html}</div>"
 
     # -------------------------
     # CSS (completo e estável)
     # -------------------------
-    css = f"""
-    <style>
-      .ci-wrap {{
-        font-family: Arial, sans-serif;
-        color: {theme.text};
-      }}
-
-      .ci-grid-2 {{
-        display:grid;
-        grid-template-columns:1fr 1fr;
-        gap:16px;
-      }}
-      @media (max-width:900px) {{
-        .ci-grid-2 {{ grid-template-columns:1fr; }}
-      }}
-
-      .ci-card {{
-        border:1px solid {theme.border_soft};
-        border-radius:14px;
-        padding:16px;
-        background:#fff;
-        margin-bottom:16px;
-      }}
-
-      .ci-card-title {{
-        font-size:18px;
-        font-weight:900;
-        margin-bottom:8px;
-      }}
-
-      .ci-note {{
-        color:{theme.muted};
-        font-size:13px;
-        margin-bottom:10px;
-      }}
+    css = _imputation_css(theme.text, theme.border_soft, theme.muted)
+
+    # Montagem final num buffer plano + um único join — sem f-string
+    # multi-KB re-copiando os fragmentos já prontos.
+    html = "".join(
+        (
+            css,
+            '<div class="ci-wrap"><div class="ci-grid-2">',
+            _card("Decisão explícita de imputação", s41),
+            _card("Resumo da execução", s42),
+            "</div>",
+            _card("Impacto estrutural (Antes × Depois)", s43),
+            _card("Estratégias aplicadas", s44),
+            _card("Relatório de imputação (auditável)", report),
+            "</div>",
+        )
+    )
 
-      .ci-k {{
-        font-size:12px;
-        color:{theme.muted};
-      }}
+    return _as_html(html)
 
-      .ci-v {{
-        font-size:14px;
-        overflow-wrap:anywhere;
-      }}
 
-      .ci-kvwrap {{
-        display:grid;
-        gap:10px;
-      }}
+# ============================================================
+# Seção 5 — Preparação para Modelagem (UI)
+# ============================================================
+# CSS da Seção 5 não depende de tema — constante única alocada no import.
+_MODELING_CSS_HTML = """
+    <style>
+      .ci-wrap { font-family: Arial, sans-serif; color: #111827; }
 
-      .ci-subtitle {{
-        margin-top:12px;
-        margin-bottom:6px;
-        font-size:13px;
-        color:{theme.muted};
-      }}
+      .ci-grid-2 { display: grid; grid-template-columns: 1fr 1fr; gap: 16px; }
+      @media (max-width:900px) { .ci-grid-2 { grid-template-columns: 1fr; } }
 
-      table.ci-table {{
-        width:100%;
-        border-collapse:collapse;
-      }}
-      table.ci-table th, table.ci-table td {{
-        padding:8px;
-        border-top:1px solid {theme.border_soft};
-        font-size:13px;
-      }}
+      .ci-card { border: 1px solid #e8edf3; border-radius: 14px; padding: 16px; background: #fff; margin-bottom: 16px; }
+      .ci-card-title { font-size: 18px; font-weight: 900; margin-bottom: 8px; }
+      .ci-card-body { font-size: 13px; }
 
-      .ci-blockgrid {{
-        display:grid;
-        grid-template-columns:repeat(2,minmax(0,1fr));
-        gap:16px;
-      }}
-      @media (max-width:900px) {{
-        .ci-blockgrid {{ grid-template-columns:1fr; }}
-      }}
+      .ci-note { color: #6b7280; font-size: 13px; margin-bottom: 10px; line-height: 1.35; }
+      .ci-subtitle { margin-top: 10px; margin-bottom: 6px; font-size: 13px; color: #6b7280; }
 
-      .ci-colblock {{
-        border:1px solid {theme.border_soft};
-        border-radius:12px;
-        padding:16px;
-        background:#fff;
-      }}
+      .ci-k { font-size: 12px; color: #6b7280; }
+      .ci-v { font-size: 14px; overflow-wrap: anywhere; }
 
-      .ci-coltitle {{
-        display:flex;
-        justify-content:space-between;
-        margin-bottom:6px;
-      }}
+      .ci-kvwrap { display: grid; gap: 10px; }
+      .ci-kvwrap-compact { grid-template-columns: repeat(3, minmax(0, 1fr)); gap: 8px 12px; }
+      @media (max-width: 900px) { .ci-kvwrap-compact { grid-template-columns: repeat(2, minmax(0, 1fr)); } }
+      @media (max-width: 600px) { .ci-kvwrap-compact { grid-template-columns: 1fr; } }
 
-      .ci-colmeta {{
-        border-bottom:1px dashed {theme.border_soft};
-        padding-bottom:8px;
-        margin-bottom:12px;
-        font-size:12px;
-        color:{theme.muted};
-      }}
+      table.ci-table { width: 100%; border-collapse: collapse; }
+      table.ci-table th, table.ci-table td { padding: 8px; border-top: 1px solid #e8edf3; font-size: 13px; vertical-align: top; }
+      table.ci-table th { color: #6b7280; font-weight: 800; background: #fbfbfb; }
 
-      .ci-kvgrid {{
-        display:grid;
-        grid-template-columns:1fr 1fr;
-        gap:10px 14px;
-      }}
-      @media (max-width:700px) {{
-        .ci-kvgrid {{ grid-template-columns:1fr; }}
-      }}
+      .ci-muted { color: #6b7280; }
+      .ci-mono { font-family: ui-monospace, SFMono-Regular, Menlo, Monaco, Consolas, "Liberation Mono", "Courier New", monospace; }
+      .ci-ul { margin: 8px 0 0 18px; }
     </style>
     """
 
-    html = f"""
-    {css}
-    <div class="ci-wrap">
-      <div class="ci-grid-2">
-        {_card("Decisão explícita de imputação", s41)}
-        {_card("Resumo da execução", s42)}
-      </div>
 
-      {_card("Impacto estrutural (Antes × Depois)", s43)}
-      {_card("Estratégias aplicadas", s44)}
-      {_card("Relatório de imputação (auditável)", report)}
-    </div>
-    """
-
-    try:
-        from IPython.display import HTML
-        return HTML(html)
-    except Exception:
-        return html
-
-
-# ============================================================
-# Seção 5 — Preparação para Modelagem (UI)
-# ============================================================
 def render_modeling_report(payload: dict, title: str = "Seção 5 — Preparação para Modelagem (Split + Auditoria)"):
     """
     Renderer UI-only para a Seção 5 (Split treino/teste e auditoria).
@@ -2112,8 +2710,6 @@ def render_modeling_report(payload: dict, title: str = "Seção 5 — Preparaç
         - risk_checks: dict
         - categorical_cardinality: pd.DataFrame (opcional)
     """
-    import pandas as pd
-
     if not isinstance(payload, dict):
         raise TypeError("payload deve ser um dicionário.")
 
@@ -2129,15 +2725,8 @@ def render_modeling_report(payload: dict, title: str = "Seção 5 — Preparaç
     # -------------------------
     # Helpers (HTML)
     # -------------------------
-    def _safe(x) -> str:
-        s = "" if x is None else str(x)
-        return (
-            s.replace("&", "&amp;")
-             .replace("<", "&lt;")
-             .replace(">", "&gt;")
-             .replace('"', "&quot;")
-             .replace("'", "&#39;")
-        )
+    # Mesmo racional da Seção 4: escape single-pass via helper de módulo.
+    _safe = _safe_html
 
     def _card(title_txt: str, body_html: str) -> str:
         # ✅ Renderiza o título do card (padrão visual/narrativo do notebook)
@@ -2148,10 +2737,8 @@ def render_modeling_report(payload: dict, title: str = "Seção 5 — Preparaç
         </div>
         """
 
-    def _df_table(df: pd.DataFrame, max_rows: int = 60) -> str:
-        if df is None or not isinstance(df, pd.DataFrame) or df.empty:
-            return "<span class='ci-muted'>—</span>"
-        return df.head(max_rows).to_html(index=False, escape=True, classes="ci-table")
+    # Tabelas pandas via helper compartilhado de módulo (mesmo racional da S4).
+    _df_table = _df_table_html
 
     def _kv(k: str, v) -> str:
         return f"""
@@ -2174,24 +2761,22 @@ def render_modeling_report(payload: dict, title: str = "Seção 5 — Preparaç
     # -------------------------
     # Extrai shapes de forma tolerante
     # -------------------------
-    X_train = split.get("X_train", None)
-    X_test = split.get("X_test", None)
-    y_train = split.get("y_train", None)
-    y_test = split.get("y_test", None)
-
-    X_train_shape = shapes.get("X_train")
-    X_test_shape = shapes.get("X_test")
-    y_train_shape = shapes.get("y_train")
-    y_test_shape = shapes.get("y_test")
-
-    if X_train_shape is None and hasattr(X_train, "shape"):
-        X_train_shape = {"rows": int(X_train.shape[0]), "cols": int(X_train.shape[1])}
-    if X_test_shape is None and hasattr(X_test, "shape"):
-        X_test_shape = {"rows": int(X_test.shape[0]), "cols": int(X_test.shape[1])}
-    if y_train_shape is None and hasattr(y_train, "shape"):
-        y_train_shape = {"rows": int(y_train.shape[0])}
-    if y_test_shape is None and hasattr(y_test, "shape"):
-        y_test_shape = {"rows": int(y_test.shape[0])}
+    def _shape_of(obj, with_cols: bool):
+        # Fallback: lê .shape do objeto do split quando diagnostics não trouxe.
+        shp = getattr(obj, "shape", None)
+        if shp is None:
+            return None
+        return {"rows": int(shp[0]), "cols": int(shp[1])} if with_cols else {"rows": int(shp[0])}
+
+    resolved_shapes = {}
+    for key, with_cols in (("X_train", True), ("X_test", True), ("y_train", False), ("y_test", False)):
+        shp = shapes.get(key)
+        resolved_shapes[key] = shp if shp is not None else _shape_of(split.get(key), with_cols)
+
+    X_train_shape = resolved_shapes["X_train"]
+    X_test_shape = resolved_shapes["X_test"]
+    y_train_shape = resolved_shapes["y_train"]
+    y_test_shape = resolved_shapes["y_test"]
 
     # -------------------------
     # [S5.1] Card — Decisão Explícita do Split
@@ -2266,10 +2851,42 @@ def render_modeling_report(payload: dict, title: str = "Seção 5 — Preparaç
     # -------------------------
     # CSS (similar ao padrão)
     # -------------------------
-    css = """
+    css = _MODELING_CSS_HTML
+
+    # Card “capa” opcional (se você quiser manter o title global)
+    header_html = f"""
+    <div class="ci-note">
+      Esta seção é estritamente diagnóstica/estrutural. Nenhuma decisão de modelagem é tomada aqui.
+    </div>
+    """
+
+    html = f"""
+    {css}
+    <div class="ci-wrap">
+      <div class="ci-grid-2">
+        {_card("Decisão Explícita do Split", decision_html)}
+        {_card("Shapes de Treino e Teste", shapes_html)}
+      </div>
+      {_card("Distribuição do Target (Pré vs Pós-Split)", target_html)}
+      {_card("Diagnóstico de Riscos Estruturais", risks_html)}
+      {_card("Cardinalidade Categórica Pós-Split", cat_html)}
+    </div>
+    """
+
+    return _as_html(html)
+
+# ============================================================
+# Seção 6 — Representação para Modelagem Supervisionada (UI)
+# ============================================================
+# Helpers de apresentação da Seção 6 em escopo de módulo: como closures,
+# eram recriados (objeto de função + células) a cada render, descartando
+# inclusive o aquecimento dos inline caches do CPython 3.11+.
+
+
+# Stylesheet da Seção 6: estático, alocado uma vez no import.
+_CSS_S6 = """
     <style>
       .ci-wrap { font-family: Arial, sans-serif; color: #111827; }
-
       .ci-grid-2 { display: grid; grid-template-columns: 1fr 1fr; gap: 16px; }
       @media (max-width:900px) { .ci-grid-2 { grid-template-columns: 1fr; } }
 
@@ -2293,40 +2910,119 @@ def render_modeling_report(payload: dict, title: str = "Seção 5 — Preparaç
       table.ci-table th { color: #6b7280; font-weight: 800; background: #fbfbfb; }
 
       .ci-muted { color: #6b7280; }
-      .ci-mono { font-family: ui-monospace, SFMono-Regular, Menlo, Monaco, Consolas, "Liberation Mono", "Courier New", monospace; }
-      .ci-ul { margin: 8px 0 0 18px; }
+
+      .ci-chips { display:flex; flex-wrap:wrap; gap:6px; }
+      .ci-chip {
+        padding:3px 8px; border-radius:999px;
+        border:1px solid #ededed; background:#fafafa;
+        font-family: ui-monospace, SFMono-Regular, Menlo, Monaco, Consolas, "Liberation Mono", "Courier New", monospace;
+        font-size:12px;
+      }
+
+      .ci-badge {
+        display:inline-flex; align-items:center; gap:6px;
+        padding: 4px 10px;
+        border-radius: 999px;
+        border: 1px solid #e8edf3;
+        font-size: 12px;
+        font-weight: 800;
+        background: #f8fafc;
+      }
+      .ci-badge-ok { color: #16a34a; border-color:#bbf7d0; background:#ecfdf5; }
+      .ci-badge-warn { color: #b45309; border-color:#fde68a; background:#fffbeb; }
     </style>
     """
 
-    # Card “capa” opcional (se você quiser manter o title global)
-    header_html = f"""
-    <div class="ci-note">
-      Esta seção é estritamente diagnóstica/estrutural. Nenhuma decisão de modelagem é tomada aqui.
-    </div>
-    """
 
-    html = f"""
-    {css}
-    <div class="ci-wrap">
-      <div class="ci-grid-2">
-        {_card("Decisão Explícita do Split", decision_html)}
-        {_card("Shapes de Treino e Teste", shapes_html)}
-      </div>
-      {_card("Distribuição do Target (Pré vs Pós-Split)", target_html)}
-      {_card("Diagnóstico de Riscos Estruturais", risks_html)}
-      {_card("Cardinalidade Categórica Pós-Split", cat_html)}
-    </div>
-    """
+def _s6_safe(x) -> str:
+    # Escape single-pass via helper de módulo, preservando o contrato
+    # local de None → string vazia. O fast path numérico (mesmo critério
+    # do _safe_html) fica inline para poupar a chamada extra — boa parte
+    # dos valores de _kv/_S8EscRow são contagens e métricas.
+    if x is None:
+        return ""
+    t = type(x)
+    if t is int or t is float or t is bool:
+        return str(x)
+    return _safe_html(x)
+
+
+def _s6_card(title_txt: str, body_html: str) -> str:
+    return f"""
+        <div class="ci-card">
+          <div class="ci-card-title">{_s6_safe(title_txt)}</div>
+          <div class="ci-card-body">{body_html}</div>
+        </div>
+        """
+
+
+def _s6_kv(k: str, v) -> str:
+    return f"""
+        <div>
+          <div class="ci-k"><b>{_s6_safe(k)}</b></div>
+          <div class="ci-v">{_s6_safe(v)}</div>
+        </div>
+        """
+
+
+def _s6_shape_str(obj) -> str:
+    if obj is None:
+        return "—"
+    if isinstance(obj, dict):
+        if "rows" in obj and "cols" in obj:
+            return f"{obj['rows']} × {obj['cols']}"
+        if "rows" in obj and "cols" not in obj:
+            return f"{obj['rows']}"
+    return _s6_safe(obj)
+
+
+# Defaults compartilhados para lookups tolerantes: evita alocar um dict/
+# tupla vazio novo a cada .get. Somente para uso leitura — sites que
+# mutam o resultado continuam criando seu próprio fallback.
+_EMPTY: dict = {}
+_EMPTY_SEQ: tuple = ()
+
+# Nomes de feature do sklearn são quase sempre identificadores puros;
+# esses dispensam o escape por completo.
+_IDENT_RE = re.compile(r"[A-Za-z0-9_]+\Z")
+
 
+def _s6_list_preview(items, max_items: int = 16) -> str:
+    if not items:
+        return "<span class='ci-muted'>—</span>"
+    # fatia antes de materializar: list/tuple só copiam os max_items
+    # exibidos; iteráveis sem len (raros aqui) ainda viram lista.
+    if not isinstance(items, (list, tuple)):
+        items = list(items)
+    rest = max(0, len(items) - max_items)
+    shown = items[:max_items] if rest else items
+    match = _IDENT_RE.match
+    # generator direto no join: sem a lista intermediária de chips
+    chips = "".join(
+        f"<span class='ci-chip'>{i if type(i) is str and match(i) else _s6_safe(i)}</span>"
+        for i in shown
+    )
+    more = f"<span class='ci-muted'>… (+{rest})</span>" if rest > 0 else ""
+    return f"<div class='ci-chips'>{chips}{more}</div>"
+
+
+def _s6_badge(ok: bool, ok_txt: str = "✓ OK", bad_txt: str = "⚠ Atenção") -> str:
+    cls = "ci-badge-ok" if ok else "ci-badge-warn"
+    txt = ok_txt if ok else bad_txt
+    return f"<span class='ci-badge {cls}'>{_s6_safe(txt)}</span>"
+
+
+def _s6_infer_shape(x):
     try:
-        from IPython.display import HTML
-        return HTML(html)
+        if hasattr(x, "shape") and x.shape is not None:
+            if len(x.shape) == 1:
+                return {"rows": int(x.shape[0])}
+            return {"rows": int(x.shape[0]), "cols": int(x.shape[1])}
     except Exception:
-        return html
+        pass
+    return None
+
 
-# ============================================================
-# Seção 6 — Representação para Modelagem Supervisionada (UI)
-# ============================================================
 def render_supervised_representation_report(
     payload: dict,
     title: str = "Seção 6 — Representação para Modelagem Supervisionada",
@@ -2349,78 +3045,30 @@ def render_supervised_representation_report(
     - representation: dict
     - diagnostics: dict
     """
-    import pandas as pd
-
     if not isinstance(payload, dict):
         raise TypeError("payload deve ser um dicionário.")
 
-    decision = payload.get("decision", {}) or {}
-    representation = payload.get("representation", {}) or {}
-    diagnostics = payload.get("diagnostics", {}) or {}
-
-    def _safe(x) -> str:
-        s = "" if x is None else str(x)
-        return (
-            s.replace("&", "&amp;")
-             .replace("<", "&lt;")
-             .replace(">", "&gt;")
-             .replace('"', "&quot;")
-             .replace("'", "&#39;")
-        )
-
-    def _card(title_txt: str, body_html: str) -> str:
-        return f"""
-        <div class="ci-card">
-          <div class="ci-card-title">{_safe(title_txt)}</div>
-          <div class="ci-card-body">{body_html}</div>
-        </div>
-        """
-
-    def _kv(k: str, v) -> str:
-        return f"""
-        <div>
-          <div class="ci-k"><b>{_safe(k)}</b></div>
-          <div class="ci-v">{_safe(v)}</div>
-        </div>
-        """
-
-    def _shape_str(obj) -> str:
-        if obj is None:
-            return "—"
-        if isinstance(obj, dict):
-            if "rows" in obj and "cols" in obj:
-                return f"{obj['rows']} × {obj['cols']}"
-            if "rows" in obj and "cols" not in obj:
-                return f"{obj['rows']}"
-        return _safe(obj)
-
-    def _df_table(df: pd.DataFrame, max_rows: int = 60) -> str:
-        if df is None or not isinstance(df, pd.DataFrame) or df.empty:
-            return "<span class='ci-muted'>—</span>"
-        return df.head(max_rows).to_html(index=False, escape=True, classes="ci-table")
+    decision = payload.get("decision") or _EMPTY
+    representation = payload.get("representation") or _EMPTY
+    diagnostics = payload.get("diagnostics") or _EMPTY
 
-    def _list_preview(items, max_items: int = 16) -> str:
-        if not items:
-            return "<span class='ci-muted'>—</span>"
-        items = list(items)
-        shown = items[:max_items]
-        rest = len(items) - len(shown)
-        chips = "".join([f"<span class='ci-chip'>{_safe(i)}</span>" for i in shown])
-        more = f"<span class='ci-muted'>… (+{rest})</span>" if rest > 0 else ""
-        return f"<div class='ci-chips'>{chips}{more}</div>"
+    # Aliases locais dos helpers de módulo (_s6_*): evita o lookup global
+    # repetido no corpo sem recriar closures por render.
+    _safe = _s6_safe
+    _card = _s6_card
+    _kv = _s6_kv
+    _shape_str = _s6_shape_str
+    _df_table = _df_table_html
+    _list_preview = _s6_list_preview
+    _badge = _s6_badge
 
-    def _badge(ok: bool, ok_txt: str = "✓ OK", bad_txt: str = "⚠ Atenção") -> str:
-        cls = "ci-badge-ok" if ok else "ci-badge-warn"
-        txt = ok_txt if ok else bad_txt
-        return f"<span class='ci-badge {cls}'>{_safe(txt)}</span>"
-
-    shapes_before = diagnostics.get("shapes_before", {}) or {}
-    shapes_after = diagnostics.get("shapes_after", {}) or {}
+    shapes_before = diagnostics.get("shapes_before") or _EMPTY
+    shapes_after = diagnostics.get("shapes_after") or {}
 
     n_features_before = diagnostics.get("n_features_before", "—")
     n_features_after = diagnostics.get("n_features_after", "—")
 
-    consistency = diagnostics.get("train_test_consistency", {}) or {}
+    consistency = diagnostics.get("train_test_consistency") or _EMPTY
     same_feature_count = bool(consistency.get("same_feature_count", False))
     feature_names_match = bool(consistency.get("feature_names_match", False))
     fit_on = diagnostics.get("fit_on", "—")
@@ -2431,31 +3079,32 @@ def render_supervised_representation_report(
     y_test_repr = representation.get("y_test")
 
     feature_names = representation.get("feature_names", []) or []
-    target_mapping = representation.get("target_mapping", decision.get("y", {}).get("mapping", {})) or {}
+    # decisão de y lida uma vez; reaproveitada no fallback do mapping e
+    # nos campos strategy/dtype do card do target
+    y_dec = decision.get("y") or {}
+    target_mapping = representation.get("target_mapping", y_dec.get("mapping", {})) or {}
 
-    def _infer_shape(x):
-        try:
-            if hasattr(x, "shape") and x.shape is not None:
-                if len(x.shape) == 1:
-                    return {"rows": int(x.shape[0])}
-                return {"rows": int(x.shape[0]), "cols": int(x.shape[1])}
-        except Exception:
-            pass
-        return None
+    _infer_shape = _s6_infer_shape
 
     if not isinstance(shapes_before, dict):
         shapes_before = {}
     if not isinstance(shapes_after, dict):
         shapes_after = {}
 
-    shapes_after.setdefault("X_train", _infer_shape(X_train_repr))
-    shapes_after.setdefault("X_test", _infer_shape(X_test_repr))
-    shapes_after.setdefault("y_train", _infer_shape(y_train_repr))
-    shapes_after.setdefault("y_test", _infer_shape(y_test_repr))
-
-    x_dec = decision.get("X", {}) or {}
-    x_cat = (x_dec.get("categorical", {}) or {})
-    x_num = (x_dec.get("numeric", {}) or {})
+    # setdefault avaliava _infer_shape mesmo quando diagnostics já trazia o
+    # shape; agora a inspeção dos arrays só acontece quando falta o valor.
+    for _key, _obj in (
+        ("X_train", X_train_repr),
+        ("X_test", X_test_repr),
+        ("y_train", y_train_repr),
+        ("y_test", y_test_repr),
+    ):
+        if shapes_after.get(_key) is None:
+            shapes_after[_key] = _infer_shape(_obj)
+
+    x_dec = decision.get("X") or _EMPTY
+    x_cat = x_dec.get("categorical") or _EMPTY
+    x_num = x_dec.get("numeric") or _EMPTY
 
     x_decision_html = f"""
     <div class="ci-note">
@@ -2494,13 +3143,21 @@ def render_supervised_representation_report(
     </div>
     """
 
-    y_dec = decision.get("y", {}) or {}
     y_strategy = y_dec.get("strategy", "—")
     y_dtype = y_dec.get("dtype", "—")
 
     if isinstance(target_mapping, dict) and target_mapping:
-        mt = pd.DataFrame([{"raw": k, "encoded": v} for k, v in target_mapping.items()])
-        mapping_table = _df_table(mt, max_rows=30)
+        # Direto do dict: o DataFrame intermediário só existia para chamar
+        # to_html numa tabela de duas colunas.
+        mapping_rows = "".join(
+            f"<tr><td>{_s6_safe(k)}</td><td>{_s6_safe(v)}</td></tr>"
+            for k, v in islice(target_mapping.items(), 30)
+        )
+        mapping_table = (
+            '<table class="ci-table">'
+            "<thead><tr><th>raw</th><th>encoded</th></tr></thead>"
+            f"<tbody>{mapping_rows}</tbody></table>"
+        )
     else:
         mapping_table = "<span class='ci-muted'>—</span>"
 
@@ -2542,78 +3199,50 @@ def render_supervised_representation_report(
     </div>
     """
 
-    css = """
-    <style>
-      .ci-wrap { font-family: Arial, sans-serif; color: #111827; }
-      .ci-grid-2 { display: grid; grid-template-columns: 1fr 1fr; gap: 16px; }
-      @media (max-width:900px) { .ci-grid-2 { grid-template-columns: 1fr; } }
+    css = _CSS_S6
 
-      .ci-card { border: 1px solid #e8edf3; border-radius: 14px; padding: 16px; background: #fff; margin-bottom: 16px; }
-      .ci-card-title { font-size: 18px; font-weight: 900; margin-bottom: 8px; }
-      .ci-card-body { font-size: 13px; }
+    # Montagem final plana: um único join dimensiona o buffer uma vez,
+    # sem re-copiar cada card pronto por um f-string externo.
+    html = "".join((
+        css,
+        '<div class="ci-wrap"><div class="ci-grid-2">',
+        _card("Decisão de Representação das Features (X)", x_decision_html),
+        _card("Execução do Pré-processamento (auditoria)", shapes_html),
+        "</div>",
+        _card("Decisão de Representação do Target (y)", y_html),
+        _card("Consolidação do Dataset Modelável", consolidation_html),
+        "</div>",
+    ))
 
-      .ci-note { color: #6b7280; font-size: 13px; margin-bottom: 10px; line-height: 1.35; }
-      .ci-subtitle { margin-top: 10px; margin-bottom: 6px; font-size: 13px; color: #6b7280; }
-
-      .ci-k { font-size: 12px; color: #6b7280; }
-      .ci-v { font-size: 14px; overflow-wrap: anywhere; }
-
-      .ci-kvwrap { display: grid; gap: 10px; }
-      .ci-kvwrap-compact { grid-template-columns: repeat(3, minmax(0, 1fr)); gap: 8px 12px; }
-      @media (max-width: 900px) { .ci-kvwrap-compact { grid-template-columns: repeat(2, minmax(0, 1fr)); } }
-      @media (max-width: 600px) { .ci-kvwrap-compact { grid-template-columns: 1fr; } }
+    return _as_html(html)
 
-      table.ci-table { width: 100%; border-collapse: collapse; }
-      table.ci-table th, table.ci-table td { padding: 8px; border-top: 1px solid #e8edf3; font-size: 13px; vertical-align: top; }
-      table.ci-table th { color: #6b7280; font-weight: 800; background: #fbfbfb; }
 
-      .ci-muted { color: #6b7280; }
 
-      .ci-chips { display:flex; flex-wrap:wrap; gap:6px; }
-      .ci-chip {
-        padding:3px 8px; border-radius:999px;
-        border:1px solid #ededed; background:#fafafa;
-        font-family: ui-monospace, SFMono-Regular, Menlo, Monaco, Consolas, "Liberation Mono", "Courier New", monospace;
-        font-size:12px;
-      }
+# ============================================================
+# Seção 7 — Estratégia de Avaliação e Baselines
+# ============================================================
 
-      .ci-badge {
-        display:inline-flex; align-items:center; gap:6px;
-        padding: 4px 10px;
-        border-radius: 999px;
-        border: 1px solid #e8edf3;
-        font-size: 12px;
-        font-weight: 800;
-        background: #f8fafc;
-      }
-      .ci-badge-ok { color: #16a34a; border-color:#bbf7d0; background:#ecfdf5; }
-      .ci-badge-warn { color: #b45309; border-color:#fde68a; background:#fffbeb; }
-    </style>
+def _counts_to_html(dist: dict, split_name: str) -> str:
     """
-
-    html = f"""
-    {css}
-    <div class="ci-wrap">
-      <div class="ci-grid-2">
-        {_card("Decisão de Representação das Features (X)", x_decision_html)}
-        {_card("Execução do Pré-processamento (auditoria)", shapes_html)}
-      </div>
-      {_card("Decisão de Representação do Target (y)", y_html)}
-      {_card("Consolidação do Dataset Modelável", consolidation_html)}
-    </div>
+    Tabela classe/contagem/pct direto dos dicts da Seção 7 — sem montar
+    um DataFrame intermediário só para chamar to_html.
     """
+    split = dist.get(split_name) or {}
+    counts = split.get("counts") or {}
+    pct = split.get("pct") or {}
+    rows = "".join(
+        f"<tr><td>{_safe_html(k)}</td><td>{_safe_html(counts[k])}</td>"
+        f"<td>{_safe_html(pct.get(k, 0.0))}</td></tr>"
+        for k in sorted(counts)
+    )
+    if not rows:
+        return "<span class='ci-muted'>—</span>"
+    return (
+        '<table class="ci-table">'
+        "<thead><tr><th>class</th><th>count</th><th>pct</th></tr></thead>"
+        f"<tbody>{rows}</tbody></table>"
+    )
 
-    try:
-        from IPython.display import HTML
-        return HTML(html)
-    except Exception:
-        return html
-
-
-
-# ============================================================
-# Seção 7 — Estratégia de Avaliação e Baselines
-# ============================================================
 
 def render_evaluation_report(
     payload: dict,
@@ -2624,23 +3253,38 @@ def render_evaluation_report(
     Não calcula nada.
     """
     import pandas as pd
-    from IPython.display import HTML, display
 
-    decision = payload.get("decision", {}) or {}
-    class_dist = payload.get("class_distribution", {}) or {}
-    results = payload.get("baselines_results", []) or []
+    display, HTML = _display_tools()
+
+    decision = payload.get("decision") or _EMPTY
+    class_dist = payload.get("class_distribution") or _EMPTY
+    results = payload.get("baselines_results") or _EMPTY_SEQ
+
+    decision_card = f"""
+      <div class="ci-card">
+        <div class="ci-card-title">Decisão de métricas</div>
+        <div class="ci-card-body">
+          <div><b>primary_metric:</b> {decision.get("primary_metric")}</div>
+          <div><b>secondary_metrics:</b> {decision.get("secondary_metrics")}</div>
+          <div><b>positive_label:</b> {decision.get("positive_label")}</div>
+        </div>
+      </div>"""
 
-    def _df_counts(d: dict, split_name: str) -> pd.DataFrame:
-        counts = (d.get(split_name, {}) or {}).get("counts", {}) or {}
-        pct = (d.get(split_name, {}) or {}).get("pct", {}) or {}
-        rows = []
-        for k in sorted(counts.keys()):
-            rows.append({"class": k, "count": counts[k], "pct": pct.get(k, 0.0)})
-        return pd.DataFrame(rows)
+    # Atalho: sem baselines executados não há tabelas a montar — só a
+    # decisão de métricas e uma nota.
+    if not results:
+        display(HTML(f"""
+    <div class="ci-wrap">
+      <h2 style="margin:0 0 10px 0;">{title}</h2>
+      {decision_card}
+      <div class="ci-muted">— sem baselines executados —</div>
+    </div>
+    """))
+        return
 
-    # tabelas
-    df_train = _df_counts(class_dist, "train")
-    df_test = _df_counts(class_dist, "test")
+    # tabelas (direto dos dicts; ver _counts_to_html)
+    train_table = _counts_to_html(class_dist, "train")
+    test_table = _counts_to_html(class_dist, "test")
 
     # baselines tabela métrica
     metrics_rows = []
@@ -2657,47 +3301,31 @@ def render_evaluation_report(
         })
     df_metrics = pd.DataFrame(metrics_rows)
 
-    html = f"""
-    <div class="ci-wrap">
-      <h2 style="margin:0 0 10px 0;">{title}</h2>
-
-      <div class="ci-card">
-        <div class="ci-card-title">Distribuição de classes</div>
-        <div class="ci-card-body">
-          <div class="ci-grid-2">
-            <div>
-              <div class="ci-muted" style="margin-bottom:6px;"><b>Treino</b></div>
-              {df_train.to_html(index=False, escape=True, classes="ci-table")}
-            </div>
-            <div>
-              <div class="ci-muted" style="margin-bottom:6px;"><b>Teste</b></div>
-              {df_test.to_html(index=False, escape=True, classes="ci-table")}
-            </div>
-          </div>
-        </div>
-      </div>
-
-      <div class="ci-card">
-        <div class="ci-card-title">Decisão de métricas</div>
-        <div class="ci-card-body">
-          <div><b>primary_metric:</b> {decision.get("primary_metric")}</div>
-          <div><b>secondary_metrics:</b> {decision.get("secondary_metrics")}</div>
-          <div><b>positive_label:</b> {decision.get("positive_label")}</div>
-        </div>
-      </div>
-
-      <div class="ci-card">
-        <div class="ci-card-title">Baselines e métricas</div>
-        <div class="ci-card-body">
-          {df_metrics.to_html(index=False, escape=True, classes="ci-table")}
-          <div class="ci-muted" style="margin-top:8px;">
-            Matrizes de confusão estão no payload (baselines_results[*].confusion_matrix).
-          </div>
-        </div>
-      </div>
-    </div>
-    """
-    display(HTML(html))
+    # Render progressivo: cada card sai num display() próprio assim que
+    # fica pronto — os dois primeiros aparecem no notebook enquanto a
+    # tabela de métricas ainda está sendo serializada.
+    display(HTML("".join((
+        '<div class="ci-wrap">',
+        f'<h2 style="margin:0 0 10px 0;">{title}</h2>',
+        '<div class="ci-card">'
+        '<div class="ci-card-title">Distribuição de classes</div>'
+        '<div class="ci-card-body"><div class="ci-grid-2">'
+        '<div><div class="ci-muted" style="margin-bottom:6px;"><b>Treino</b></div>',
+        train_table,
+        '</div><div><div class="ci-muted" style="margin-bottom:6px;"><b>Teste</b></div>',
+        test_table,
+        "</div></div></div></div></div>",
+    ))))
+    display(HTML(f'<div class="ci-wrap">{decision_card}</div>'))
+    display(HTML("".join((
+        '<div class="ci-wrap"><div class="ci-card">'
+        '<div class="ci-card-title">Baselines e métricas</div>'
+        '<div class="ci-card-body">',
+        _df_table_html(df_metrics),
+        '<div class="ci-muted" style="margin-top:8px;">'
+        "Matrizes de confusão estão no payload (baselines_results[*].confusion_matrix)."
+        "</div></div></div></div>",
+    ))))
 
 
 
@@ -2705,7 +3333,68 @@ def render_evaluation_report(
 # Seção 8 — Seleção de Modelos e Hiperparâmetros (UI)
 # ============================================================
 
-from IPython.display import HTML, display  # garanta que isso existe no topo ou aqui
+
+# Card exibido quando a Seção 8 ainda não tem leaderboard.
+_EMPTY_CARD_S8 = (
+    '<div style="font-family: Arial, sans-serif; color: #eaeaea;">'
+    '<div style="background:#111; border:1px solid rgba(255,255,255,0.08); '
+    'border-radius:12px; padding:14px;">'
+    '<div style="opacity:0.8;">— sem dados de leaderboard —</div>'
+    "</div></div>"
+)
+
+# Stylesheet da Seção 8: estático, fora do f-string final (que exigia
+# escapar cada chave CSS com {{ }}).
+_CSS_S8 = """<style>
+      .table-wrap { overflow-x:auto; }
+      .table { width: 100%; border-collapse: collapse; }
+      .table th, .table td { padding: 8px 10px; border-bottom: 1px solid rgba(255,255,255,0.08); font-size: 13px; }
+      .table th { text-align: left; opacity: 0.85; }
+      tr.selected td { background: rgba(34,197,94,0.08); }
+      tr.ineligible td { background: rgba(245,158,11,0.06); opacity: 0.8; }
+    </style>"""
+
+
+# Linha do leaderboard pré-parseada no import; cada linha sai com um
+# único format_map em vez de nove chamadas esc() num f-string.
+_S8_ROW_TMPL = """
+            <tr class="{_cls}">
+              <td>{rank}</td>
+              <td>{model_key}</td>
+              <td>{display_name}</td>
+              <td>{_primary}</td>
+              <td>{f1}</td>
+              <td>{accuracy}</td>
+              <td>{precision}</td>
+              <td>{eligible}</td>
+              <td>{train_mode}</td>
+            </tr>
+            """
+
+
+class _S8EscRow(dict):
+    # Escapa no acesso: o format_map consulta cada slot via __getitem__,
+    # então o escape acontece uma vez por campo, com o mesmo contrato
+    # None/ausente → "" do esc() anterior.
+    def __getitem__(self, k):
+        return _s6_safe(super().get(k, ""))
+
+
+def _s8_row_html(r: dict, selected_key, primary_metric: str) -> str:
+    """Formata uma linha do leaderboard da Seção 8 (função de módulo:
+    nada de closure recriada por render)."""
+    model_key = r.get("model_key")
+    eligible = r.get("eligible", True)
+    if selected_key and model_key == selected_key:
+        tr_class = "selected"
+    elif eligible is False:
+        tr_class = "ineligible"
+    else:
+        tr_class = ""
+    row = _S8EscRow(r)
+    row["_cls"] = tr_class
+    row["_primary"] = r.get(primary_metric)
+    return _S8_ROW_TMPL.format_map(row)
 
 
 def render_model_selection_report(
@@ -2718,12 +3407,14 @@ def render_model_selection_report(
     Espera payload produzido por:
     - src.models.model_selection.run_section8_model_selection
     """
+    display, HTML = _display_tools()
+
     if not isinstance(payload, dict):
         raise TypeError("payload deve ser um dict")
 
     leaderboard = payload.get("leaderboard")
-    selection = payload.get("selection", {}) or {}
-    inherited = payload.get("inherited_decision", {}) or {}
+    selection = payload.get("selection") or _EMPTY
+    inherited = payload.get("inherited_decision") or _EMPTY
 
     selected_key = selection.get("selected_model_key")
     primary_metric = (inherited.get("primary_metric") or "recall")
@@ -2732,94 +3423,55 @@ def render_model_selection_report(
     # Leaderboard pode ser DataFrame (ideal) ou lista de dicts (fallback)
     if leaderboard is None:
         lb_rows = []
-    elif hasattr(leaderboard, "to_dict"):
-        lb_rows = leaderboard.to_dict(orient="records")
+    elif hasattr(leaderboard, "itertuples"):
+        # itertuples + zip no lugar de to_dict(orient="records"): mesma
+        # lista de dicts sem o dispatch de dtype/NaN por célula do to_dict.
+        cols = list(leaderboard.columns)
+        lb_rows = [dict(zip(cols, row)) for row in leaderboard.itertuples(index=False, name=None)]
     elif isinstance(leaderboard, list):
         lb_rows = leaderboard
     else:
         lb_rows = []
 
-    def esc(x):
-        return "" if x is None else str(x).replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
-
-    rows_html = []
-    for r in lb_rows:
-        model_key = r.get("model_key")
-        eligible = r.get("eligible", True)
-        tr_class = ""
-        if selected_key and model_key == selected_key:
-            tr_class = "selected"
-        elif eligible is False:
-            tr_class = "ineligible"
-
-        rows_html.append(
-            f"""
-            <tr class="{tr_class}">
-              <td>{esc(r.get("rank"))}</td>
-              <td>{esc(r.get("model_key"))}</td>
-              <td>{esc(r.get("display_name"))}</td>
-              <td>{esc(r.get(primary_metric))}</td>
-              <td>{esc(r.get("f1"))}</td>
-              <td>{esc(r.get("accuracy"))}</td>
-              <td>{esc(r.get("precision"))}</td>
-              <td>{esc(r.get("eligible"))}</td>
-              <td>{esc(r.get("train_mode"))}</td>
-            </tr>
-            """
-        )
-
-    html = f"""
-    <div style="font-family: Arial, sans-serif; color: #eaeaea;">
-      <div style="background:#111; border:1px solid rgba(255,255,255,0.08); border-radius:12px; padding:14px;">
-        <div style="font-size:18px; font-weight:700; margin-bottom:10px;">{esc(title)}</div>
-
-        <div style="display:flex; gap:10px; flex-wrap:wrap; margin-bottom:12px;">
-          <div style="background:#0b1220; border:1px solid rgba(255,255,255,0.08); border-radius:10px; padding:10px 12px;">
-            <div style="opacity:0.8; font-size:12px;">Métrica principal (S7)</div>
-            <div style="font-weight:700;">{esc(primary_metric)}</div>
-          </div>
-
-          <div style="background:#0b1220; border:1px solid rgba(255,255,255,0.08); border-radius:10px; padding:10px 12px;">
-            <div style="opacity:0.8; font-size:12px;">Gate baselines (threshold)</div>
-            <div style="font-weight:700;">{esc(baseline_thr)}</div>
-          </div>
+    # Atalho: sem linhas não há tabela (nem esqueleto vazio) a emitir.
+    if not lb_rows:
+        display(HTML(_EMPTY_CARD_S8))
+        return
 
-          <div style="background:#071a10; border:1px solid rgba(255,255,255,0.08); border-radius:10px; padding:10px 12px;">
-            <div style="opacity:0.8; font-size:12px;">Selecionado</div>
-            <div style="font-weight:700;">{esc(selected_key) if selected_key else "Nenhum (não superou baselines)"}</div>
-          </div>
-        </div>
+    def esc(x):
+        # Mesmo translate single-pass do módulo; None → "" como antes.
+        return "" if x is None else _safe_html(x)
 
-        <div class="table-wrap">
-          <table class="table">
-            <thead>
-              <tr>
-                <th>rank</th>
-                <th>model_key</th>
-                <th>display_name</th>
-                <th>{esc(primary_metric)}</th>
-                <th>f1</th>
-                <th>accuracy</th>
-                <th>precision</th>
-                <th>eligible</th>
-                <th>train_mode</th>
-              </tr>
-            </thead>
-            <tbody>
-              {''.join(rows_html)}
-            </tbody>
-          </table>
-        </div>
-      </div>
-    </div>
+    # join direto sobre o generator: sem lista intermediária de linhas
+    rows_html = "\n".join(
+        _s8_row_html(r, selected_key, primary_metric) for r in lb_rows
+    )
 
-    <style>
-      .table-wrap { overflow-x:auto; }
-      .table { width: 100%; border-collapse: collapse; }
-      .table th, .table td { padding: 8px 10px; border-bottom: 1px solid rgba(255,255,255,0.08); font-size: 13px; }
-      .table th { text-align: left; opacity: 0.85; }
-      tr.selected td { background: rgba(34,197,94,0.08); }
-      tr.ineligible td { background: rgba(245,158,11,0.06); opacity: 0.8; }
-    </style>
-    """
+    selected_label = esc(selected_key) if selected_key else "Nenhum (não superou baselines)"
+
+    # Montagem final plana: cabeçalho, cards de decisão, tabela e CSS num
+    # único join, sem o f-string gigante.
+    html = "".join((
+        '<div style="font-family: Arial, sans-serif; color: #eaeaea;">'
+        '<div style="background:#111; border:1px solid rgba(255,255,255,0.08); border-radius:12px; padding:14px;">',
+        f'<div style="font-size:18px; font-weight:700; margin-bottom:10px;">{esc(title)}</div>',
+        '<div style="display:flex; gap:10px; flex-wrap:wrap; margin-bottom:12px;">'
+        '<div style="background:#0b1220; border:1px solid rgba(255,255,255,0.08); border-radius:10px; padding:10px 12px;">'
+        '<div style="opacity:0.8; font-size:12px;">Métrica principal (S7)</div>',
+        f'<div style="font-weight:700;">{esc(primary_metric)}</div></div>',
+        '<div style="background:#0b1220; border:1px solid rgba(255,255,255,0.08); border-radius:10px; padding:10px 12px;">'
+        '<div style="opacity:0.8; font-size:12px;">Gate baselines (threshold)</div>',
+        f'<div style="font-weight:700;">{esc(baseline_thr)}</div></div>',
+        '<div style="background:#071a10; border:1px solid rgba(255,255,255,0.08); border-radius:10px; padding:10px 12px;">'
+        '<div style="opacity:0.8; font-size:12px;">Selecionado</div>',
+        f'<div style="font-weight:700;">{selected_label}</div></div></div>',
+        '<div class="table-wrap"><table class="table"><thead><tr>'
+        "<th>rank</th><th>model_key</th><th>display_name</th>",
+        f"<th>{esc(primary_metric)}</th>",
+        "<th>f1</th><th>accuracy</th><th>precision</th><th>eligible</th><th>train_mode</th>"
+        "</tr></thead><tbody>",
+        rows_html,
+        "</tbody></table></div></div></div>",
+        _CSS_S8,
+    ))
     display(HTML(html))